@@ -1,27 +1,39 @@
 # app/__init__.py
 from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
-from flask_mail import Mail
 from config import Config
+from app.utils import replicas
 
-db = SQLAlchemy()
+db = replicas.RoutingSQLAlchemy()
 login_manager = LoginManager()
-mail = Mail()
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    replicas.init_app(app)
     db.init_app(app)
     login_manager.init_app(app)
-    mail.init_app(app)
 
     login_manager.login_view = 'auth.login'
 
-    from app.routes import auth, student, company
+    from app.utils import tenancy
+    tenancy.init_app(app)
+    from app.utils import changes  # registers the change-capture hooks
+
+    from app.routes import auth, student, company, alumni
     app.register_blueprint(auth.bp)
     app.register_blueprint(student.bp)
     app.register_blueprint(company.bp)
+    app.register_blueprint(alumni.bp)
+
+    from app import commands
+    commands.init_app(app)
+
+    # Lazy mode (the default) leaves mail and the NumPy/pypdf-backed feature
+    # modules to be imported on first use; eager mode pays for them up front.
+    if not app.config['LAZY_LOADING']:
+        from app.utils import email, recommend, resumes
+        email.init_mail(app)
 
     return app
\ No newline at end of file
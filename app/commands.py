@@ -0,0 +1,112 @@
+# app/commands.py
+import click
+
+
+def init_app(app):
+    @app.cli.command('migrate')
+    def migrate():
+        from app import db
+
+        db.create_all()
+        click.echo('Database schema is up to date.')
+
+    @app.cli.command('startup-profile')
+    @click.option('--runs', default=5, help='Cold starts timed per mode.')
+    def startup_profile(runs):
+        from app.utils.startup import cold_start, import_profile
+
+        for label, lazy in (('eager', '0'), ('lazy', '1')):
+            env = {'LAZY_LOADING': lazy}
+            click.echo(f'{label}: cold start {cold_start(env, runs) * 1000:.0f}ms (median of {runs})')
+            for name, self_us in import_profile(env):
+                click.echo(f'  {name:<24} {self_us / 1000:7.1f}ms')
+
+    @app.cli.command('schedule-interviews')
+    @click.option('--job', 'job_ids', multiple=True, type=int,
+                  help='Only schedule these job ids (default: all jobs).')
+    @click.option('--gap', default=0, help='Minutes a student needs between interviews.')
+    def schedule_interviews(job_ids, gap):
+        from app.utils.scheduler import schedule_shortlisted
+
+        assigned, unassigned = schedule_shortlisted(list(job_ids), gap)
+        click.echo(f'Booked {len(assigned)} interviews, {len(unassigned)} could not be placed.')
+
+    @app.cli.command('build-recommendations')
+    def build_recommendations():
+        from app.utils.recommend import write_features
+
+        n_jobs, n_students = write_features(app.config['RECOMMENDATIONS_PATH'])
+        click.echo(f'Wrote features for {n_jobs} jobs and {n_students} students.')
+
+    @app.cli.command('reprocess-resumes')
+    @click.option('--stale-minutes', default=10,
+                  help='Only retry uploads left pending for at least this long.')
+    def reprocess_resumes(stale_minutes):
+        from datetime import timedelta
+
+        from app.utils.resumes import reprocess_pending
+
+        click.echo(f'Reprocessed {reprocess_pending(timedelta(minutes=stale_minutes))} resumes.')
+
+    @app.cli.command('worker')
+    @click.option('--lease', default=60, help='Seconds a claimed job stays reserved.')
+    @click.option('--batch', default=10, help='Jobs claimed per round trip.')
+    @click.option('--poll', default=1.0, help='Seconds to sleep when the queue is empty.')
+    @click.option('--burst', is_flag=True, help='Exit once the queue is empty.')
+    def worker(lease, batch, poll, burst):
+        from app.utils.jobs import work
+
+        processed = work(lease=lease, batch=batch, poll_interval=poll, burst=burst)
+        click.echo(f'Processed {processed} jobs.')
+
+    @app.cli.command('queue-stats')
+    def queue_stats():
+        from app.utils.jobs import queue_stats
+
+        for key, value in queue_stats().items():
+            click.echo(f'{key}: {value}')
+
+    @app.cli.command('allocate-offers')
+    @click.option('--job', 'job_ids', multiple=True, type=int,
+                  help='Only allocate these job ids (default: all jobs).')
+    @click.option('--dry-run', is_flag=True, help='Report the matching without saving it.')
+    def allocate_offers(job_ids, dry_run):
+        from app.utils.placement import allocate
+
+        matches, unmatched = allocate(list(job_ids), dry_run)
+        click.echo(f'{"Would make" if dry_run else "Made"} {len(matches)} offers, '
+                   f'{unmatched} shortlisted students left without one.')
+
+    @app.cli.command('rebuild-placement-state')
+    def rebuild_placement_state():
+        from app.utils.placement import rebuild_state
+
+        click.echo(f'{rebuild_state()} students placed.')
+
+    @app.cli.command('change-log')
+    @click.option('--prune-days', type=int, default=None,
+                  help='Delete records older than this that every consumer has read.')
+    def change_log(prune_days):
+        from datetime import timedelta
+        from app.utils.changes import consumer_lag, prune
+
+        if prune_days is not None:
+            click.echo(f'Pruned {prune(timedelta(days=prune_days))} change records.')
+        head, lag = consumer_lag()
+        click.echo(f'head offset: {head}')
+        for name, behind in sorted(lag.items()):
+            click.echo(f'  {name:<24} {behind} behind')
+
+    @app.cli.command('archive-season')
+    @click.argument('season')
+    @click.option('--institute', default=None, help='Defaults to INSTITUTE_DOMAIN.')
+    def archive_season(season, institute):
+        from app.utils.tenancy import archive_season, archive_url, tenant_for
+
+        tenant = tenant_for(season, institute)
+        try:
+            counts = archive_season(tenant)
+        except ValueError as exc:
+            raise click.ClickException(str(exc))
+        click.echo(f'Archived {tenant} to {archive_url(tenant)}: ' +
+                   ', '.join(f'{n} {table}' for table, n in counts.items()))
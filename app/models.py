@@ -1,8 +1,28 @@
 # app/models.py
 from app import db, login_manager
+from flask import current_app, g, has_app_context
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+import json
+
+def current_tenant():
+    # '<institute domain>:<placement season>', e.g. 'nitw.ac.in:2024-25'.
+    # A request may override it through g.tenant.
+    if has_app_context() and g.get('tenant'):
+        return g.tenant
+    return current_app.config['TENANT']
+
+def current_institute():
+    return current_tenant().partition(':')[0]
+
+class TenantMixin:
+    tenant = db.Column(db.String(100), nullable=False, index=True, default=current_tenant)
+
+class InstituteMixin:
+    # For rows that outlive a season, such as students (who are users and
+    # must keep logging in after PLACEMENT_SEASON rolls over).
+    institute = db.Column(db.String(100), nullable=False, index=True, default=current_institute)
 
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -21,13 +41,16 @@ class User(UserMixin, db.Model):
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
 
-class Student(User):
+class Student(InstituteMixin, User):
     __tablename__ = 'student'
     id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
     roll_number = db.Column(db.String(20), unique=True, nullable=False)
     name = db.Column(db.String(100), nullable=False)
     cgpa = db.Column(db.Float, nullable=False)
     branch = db.Column(db.String(50), nullable=False)
+    backlogs = db.Column(db.Integer, nullable=False, default=0)
+    graduation_year = db.Column(db.Integer)
+    gender = db.Column(db.String(20))
     resume_url = db.Column(db.String(200))
     
     applications = db.relationship('JobApplication', backref='student', lazy=True)
@@ -49,7 +72,7 @@ class Company(User):
         'polymorphic_identity': 'company',
     }
 
-class Job(db.Model):
+class Job(TenantMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     company_id = db.Column(db.Integer, db.ForeignKey('company.id'), nullable=False)
     title = db.Column(db.String(100), nullable=False)
@@ -60,12 +83,143 @@ class Job(db.Model):
     interview_process = db.Column(db.Text, nullable=False)
     interview_date = db.Column(db.DateTime, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # JSON rule tree on top of min_cgpa/eligible_branches, see app/utils/eligibility.py
+    eligibility = db.Column(db.Text)
+    rules_version = db.Column(db.Integer, nullable=False, default=1)
+    # 'regular', 'dream' or 'super_dream'; see app/utils/placement.py
+    tier = db.Column(db.String(20), nullable=False, default='regular')
+    openings = db.Column(db.Integer, nullable=False, default=1)
     
     applications = db.relationship('JobApplication', backref='job', lazy=True)
 
-class JobApplication(db.Model):
+    def set_eligibility(self, rule):
+        self.eligibility = json.dumps(rule) if rule else None
+        self.rules_version = (self.rules_version or 0) + 1
+
+class JobApplication(TenantMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
     job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
     status = db.Column(db.String(20), default='pending')
-    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Ranks for offer allocation, 1 = most preferred; unset falls back to
+    # job tier/compensation (student side) and CGPA (company side).
+    preference = db.Column(db.Integer)
+    company_rank = db.Column(db.Integer)
+
+    __table_args__ = (db.UniqueConstraint('student_id', 'job_id'),)
+
+class PlacementState(TenantMixin, db.Model):
+    # One row per placed student per season, kept current from accepted
+    # applications so policy checks never scan JobApplication. Students
+    # outlive seasons, so the season is part of the key.
+    tenant = db.Column(db.String(100), primary_key=True, default=current_tenant)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), primary_key=True)
+    tier = db.Column(db.Integer, nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
+    offers = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class Alumni(User):
+    __tablename__ = 'alumni'
+    id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    graduation_year = db.Column(db.Integer, nullable=False, index=True)
+    branch = db.Column(db.String(50), index=True)
+    company = db.Column(db.String(100), index=True)
+    position = db.Column(db.String(100))
+    linkedin_url = db.Column(db.String(200))
+    is_mentor = db.Column(db.Boolean, default=False, index=True)
+
+    __mapper_args__ = {
+        'polymorphic_identity': 'alumni',
+    }
+
+class MentorshipRequest(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
+    alumni_id = db.Column(db.Integer, db.ForeignKey('alumni.id'), nullable=False)
+    status = db.Column(db.String(20), default='pending')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    message = db.Column(db.Text)
+
+    __table_args__ = (db.UniqueConstraint('student_id', 'alumni_id'),)
+
+class InterviewSlot(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False, index=True)
+    start_time = db.Column(db.DateTime, nullable=False)
+    end_time = db.Column(db.DateTime, nullable=False)
+    capacity = db.Column(db.Integer, nullable=False, default=1)
+
+    job = db.relationship('Job', backref=db.backref('interview_slots', lazy=True))
+    bookings = db.relationship('InterviewBooking', backref='slot', lazy=True)
+
+class InterviewBooking(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    slot_id = db.Column(db.Integer, db.ForeignKey('interview_slot.id'), nullable=False, index=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('job_application.id'), nullable=False, unique=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ResumeText(db.Model):
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), primary_key=True)
+    storage_key = db.Column(db.String(200), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    text = db.Column(db.Text)
+    error = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class BackgroundJob(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    task = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')
+    priority = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    idempotency_key = db.Column(db.String(200), unique=True)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = db.Column(db.String(100))
+    locked_until = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_background_job_claim', 'status', 'priority', 'run_at'),
+    )
+
+class ChangeRecord(db.Model):
+    # Append-only change log. No foreign keys, so records outlive the rows
+    # and users they describe. `position` is the offset consumers resume
+    # from; it is handed out after the writing transaction commits (see
+    # app/utils/changes.py:sequence), so it follows commit order, not id order.
+    id = db.Column(db.Integer, primary_key=True)
+    position = db.Column(db.Integer, unique=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)
+    data = db.Column(db.Text, nullable=False, default='{}')
+    actor_id = db.Column(db.Integer)
+    tenant = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        db.Index('ix_change_record_row', 'table_name', 'row_id'),
+        # Never reuse ids of pruned records on SQLite.
+        {'sqlite_autoincrement': True},
+    )
+
+class ChangeSequence(db.Model):
+    # A single row holding the last position handed out; updating it is the
+    # lock that serializes sequencing.
+    id = db.Column(db.Integer, primary_key=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+
+class ConsumerOffset(db.Model):
+    name = db.Column(db.String(100), primary_key=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
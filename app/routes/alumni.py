@@ -0,0 +1,57 @@
+# app/routes/alumni.py
+from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
+from flask_login import login_required, current_user
+from app.models import Alumni, MentorshipRequest, Student
+from app.utils.alumni_index import search_page
+from app.utils.replicas import read_only
+from app import db
+
+bp = Blueprint('alumni', __name__)
+
+@bp.route('/alumni/network')
+@login_required
+@read_only
+def network():
+    is_student = isinstance(current_user, Student)
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = current_app.config['ALUMNI_PAGE_SIZE']
+
+    alumni, total = search_page(
+        current_app.config['ALUMNI_INDEX_TTL'], page, per_page,
+        company=request.args.get('company'),
+        position=request.args.get('position'),
+        year=request.args.get('year', type=int),
+        branch=request.args.get('branch'),
+        student_id=current_user.id if is_student else None,
+        student_branch=current_user.branch if is_student else None,
+        applied_only=is_student and request.args.get('applied') == '1'
+    )
+    return render_template('alumni/network.html', alumni=alumni, page=page,
+                           per_page=per_page, total=total)
+
+@bp.route('/alumni/request_mentorship/<int:alumni_id>', methods=['POST'])
+@login_required
+def request_mentorship(alumni_id):
+    if not isinstance(current_user, Student):
+        flash('Only students can request mentorship')
+        return redirect(url_for('alumni.network'))
+
+    Alumni.query.get_or_404(alumni_id)
+    existing_request = MentorshipRequest.query.filter_by(
+        student_id=current_user.id, alumni_id=alumni_id
+    ).first()
+
+    if existing_request:
+        flash('You have already requested mentorship from this alumni')
+        return redirect(url_for('alumni.network'))
+
+    mentorship_request = MentorshipRequest(
+        student_id=current_user.id,
+        alumni_id=alumni_id,
+        message=request.form.get('message', '')
+    )
+    db.session.add(mentorship_request)
+    db.session.commit()
+
+    flash('Mentorship request sent successfully')
+    return redirect(url_for('alumni.network'))
@@ -1,88 +1,118 @@
-# app/routes/auth.py
-from flask import Blueprint, render_template, redirect, url_for, flash, request
-from flask_login import login_user, logout_user, current_user
-from app.models import Student, Company
-from app import db
-
-bp = Blueprint('auth', __name__)
-
-@bp.route('/login', methods=['GET', 'POST'])
-def login():
-    if current_user.is_authenticated:
-        return redirect(url_for('index'))
-    
-    if request.method == 'POST':
-        email = request.form['email']
-        password = request.form['password']
-        user_type = request.form['user_type']
-        
-        user = None
-        if user_type == 'student':
-            user = Student.query.filter_by(email=email).first()
-        elif user_type == 'company':
-            user = Company.query.filter_by(email=email).first()
-            
-        if user and user.check_password(password):
-            login_user(user)
-            return redirect(url_for('index'))
-        flash('Invalid email or password')
-    return render_template('auth/login.html')
-
-@bp.route('/logout')
-def logout():
-    logout_user()
-    return redirect(url_for('index'))
-
-# app/routes/student.py
+# app/routes/company.py
+from datetime import datetime
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
-from app.models import Job, JobApplication
-from app.utils.email import send_application_notification
+from app.models import Company, InterviewSlot, Job, JobApplication
+from app.utils.eligibility_rules import parse as parse_eligibility
+from app.utils.jobs import enqueue
+from app.utils.placement import TIERS, may_apply
+from app.utils.events import publish_job, publish_status
+from app.utils.ratelimit import admit_write
+from app.utils.replicas import read_only
 from app import db
 
-bp = Blueprint('student', __name__)
+bp = Blueprint('company', __name__)
+
+APPLICATION_STATUSES = ('pending', 'shortlisted', 'rejected', 'accepted')
 
-@bp.route('/student/dashboard')
+@bp.route('/company/dashboard')
 @login_required
+@read_only
 def dashboard():
-    if not isinstance(current_user, Student):
+    if not isinstance(current_user, Company):
         return redirect(url_for('index'))
     
-    applied_jobs = JobApplication.query.filter_by(student_id=current_user.id).all()
-    return render_template('student/dashboard.html', applied_jobs=applied_jobs)
+    jobs = Job.query.filter_by(company_id=current_user.id).all()
+    return render_template('company/dashboard.html', jobs=jobs)
 
-@bp.route('/student/jobs')
+@bp.route('/company/post_job', methods=['GET', 'POST'])
 @login_required
-def jobs():
-    if not isinstance(current_user, Student):
+@admit_write
+def post_job():
+    if not isinstance(current_user, Company):
         return redirect(url_for('index'))
     
-    eligible_jobs = Job.query.filter(
-        Job.min_cgpa <= current_user.cgpa,
-        Job.eligible_branches.contains(current_user.branch)
-    ).all()
+    if request.method == 'POST':
+        try:
+            eligibility = parse_eligibility(request.form.get('eligibility'))
+        except ValueError as exc:
+            flash(str(exc))
+            return render_template('company/post_job.html')
+        tier = request.form.get('tier', 'regular')
+        if tier not in TIERS:
+            flash('Unknown job tier.')
+            return render_template('company/post_job.html')
+
+        job = Job(
+            company_id=current_user.id,
+            title=request.form['title'],
+            description=request.form['description'],
+            compensation=float(request.form['compensation']),
+            min_cgpa=float(request.form['min_cgpa']),
+            eligible_branches=request.form['eligible_branches'],
+            interview_process=request.form['interview_process'],
+            interview_date=datetime.strptime(request.form['interview_date'], '%Y-%m-%d'),
+            tier=tier,
+            openings=int(request.form.get('openings', 1))
+        )
+        job.set_eligibility(eligibility)
+        db.session.add(job)
+        db.session.flush()
+        # Eligible students are emailed by the worker, not in this request
+        enqueue('email.job_posted', {'job_id': job.id}, priority=5)
+        db.session.commit()
+        publish_job(job)
+        
+        flash('Job posted successfully!')
+        return redirect(url_for('company.dashboard'))
     
-    return render_template('student/jobs.html', jobs=eligible_jobs)
+    return render_template('company/post_job.html')
 
-@bp.route('/student/apply/<int:job_id>', methods=['POST'])
+@bp.route('/company/job/<int:job_id>/slots', methods=['POST'])
 @login_required
-def apply_job(job_id):
-    if not isinstance(current_user, Student):
+def add_interview_slot(job_id):
+    if not isinstance(current_user, Company):
         return redirect(url_for('index'))
-    
-    job = Job.query.get_or_404(job_id)
-    existing_application = JobApplication.query.filter_by(
-        student_id=current_user.id, job_id=job_id
-    ).first()
-    
-    if existing_application:
-        flash('You have already applied for this job.')
-        return redirect(url_for('student.jobs'))
-    
-    application = JobApplication(student_id=current_user.id, job_id=job_id)
-    db.session.add(application)
+
+    job = Job.query.filter_by(id=job_id, company_id=current_user.id).first_or_404()
+    slot = InterviewSlot(
+        job_id=job.id,
+        start_time=datetime.strptime(request.form['start_time'], '%Y-%m-%dT%H:%M'),
+        end_time=datetime.strptime(request.form['end_time'], '%Y-%m-%dT%H:%M'),
+        capacity=int(request.form.get('capacity', 1))
+    )
+    if slot.end_time <= slot.start_time:
+        flash('Interview slot must end after it starts.')
+        return redirect(url_for('company.dashboard'))
+
+    db.session.add(slot)
     db.session.commit()
-    
-    send_application_notification(job.company, current_user, job)
-    flash('Successfully applied for the job!')
-    return redirect(url_for('student.dashboard'))
\ No newline at end of file
+    flash('Interview slot added.')
+    return redirect(url_for('company.dashboard'))
+
+@bp.route('/company/application/<int:application_id>/status', methods=['POST'])
+@login_required
+@admit_write
+def update_application_status(application_id):
+    if not isinstance(current_user, Company):
+        return redirect(url_for('index'))
+
+    application = JobApplication.query.join(Job).filter(
+        JobApplication.id == application_id,
+        Job.company_id == current_user.id
+    ).first_or_404()
+
+    status = request.form['status']
+    if status not in APPLICATION_STATUSES:
+        flash('Unknown application status.')
+        return redirect(url_for('company.dashboard'))
+    if (status == 'accepted' and application.status != 'accepted'
+            and not may_apply(application.student_id, application.job)):
+        flash('This student already holds an offer the placement policy does not let them leave.')
+        return redirect(url_for('company.dashboard'))
+
+    application.status = status
+    db.session.commit()
+    publish_status(application)
+    flash('Application status updated.')
+    return redirect(url_for('company.dashboard'))
\ No newline at end of file
@@ -0,0 +1,149 @@
+# app/routes/student.py
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app
+from flask import Response, g, stream_with_context
+from flask_login import login_required, current_user
+from sqlalchemy.exc import IntegrityError
+from app.models import Job, JobApplication, Student, current_tenant
+from app.utils.eligibility import eligible_jobs
+from app.utils.jobs import enqueue
+from app.utils.placement import may_apply
+from app.utils.events import stream
+from app.utils.ratelimit import admit_write, rate_limit
+from app.utils.replicas import read_only
+from app import db
+
+bp = Blueprint('student', __name__)
+
+def eligible_jobs_query(student):
+    # Cheap SQL prefilter on the legacy columns; eligible_jobs() applies the
+    # rest of each job's rule.
+    return Job.query.filter(
+        Job.min_cgpa <= student.cgpa,
+        Job.eligible_branches.contains(student.branch)
+    )
+
+@bp.route('/student/dashboard')
+@login_required
+@read_only
+def dashboard():
+    if not isinstance(current_user, Student):
+        return redirect(url_for('index'))
+    
+    applied_jobs = JobApplication.query.filter_by(student_id=current_user.id).all()
+    return render_template('student/dashboard.html', applied_jobs=applied_jobs)
+
+@bp.route('/student/jobs')
+@login_required
+@read_only
+def jobs():
+    if not isinstance(current_user, Student):
+        return redirect(url_for('index'))
+    
+    jobs = eligible_jobs(current_user, eligible_jobs_query(current_user).all())
+    
+    return render_template('student/jobs.html', jobs=jobs)
+
+@bp.route('/student/recommendations')
+@login_required
+@read_only
+def recommendations():
+    if not isinstance(current_user, Student):
+        return redirect(url_for('index'))
+
+    applied = db.session.query(JobApplication.job_id).filter_by(student_id=current_user.id)
+    candidates = eligible_jobs_query(current_user).filter(~Job.id.in_(applied)).all()
+    job_ids = [job.id for job in eligible_jobs(current_user, candidates)]
+
+    from app.utils.recommend import get_store
+
+    store = get_store(current_app.config['RECOMMENDATIONS_PATH'])
+    # Bounded either way: a negative k breaks argpartition, a huge one
+    # renders every job.
+    k = max(1, min(request.args.get('k', 10, type=int), 50))
+    if store is None:
+        ranked = sorted(job_ids, reverse=True)[:k]
+    else:
+        ranked = store.top_k(current_user.id, job_ids, k)
+
+    jobs_by_id = {job.id: job for job in Job.query.filter(Job.id.in_(ranked))}
+    return render_template('student/jobs.html', jobs=[jobs_by_id[j] for j in ranked])
+
+@bp.route('/student/apply/<int:job_id>', methods=['POST'])
+@login_required
+@rate_limit('apply')
+@admit_write
+def apply_job(job_id):
+    if not isinstance(current_user, Student):
+        return redirect(url_for('index'))
+    
+    job = Job.query.get_or_404(job_id)
+    if not eligible_jobs(current_user, [job]):
+        flash('You are not eligible for this job.')
+        return redirect(url_for('student.jobs'))
+    if not may_apply(current_user.id, job):
+        flash('The placement policy does not allow you to apply to this job.')
+        return redirect(url_for('student.jobs'))
+
+    if current_app.config['APPLICATION_WRITE_BATCHING']:
+        from app.utils.write_batcher import DUPLICATE, get_batcher
+
+        outcome, _ = get_batcher().submit(current_user.id, job.id, current_tenant()).result()
+        if outcome == DUPLICATE:
+            flash('You have already applied for this job.')
+            return redirect(url_for('student.jobs'))
+        g.db_wrote = True
+        flash('Successfully applied for the job!')
+        return redirect(url_for('student.dashboard'))
+
+    existing_application = JobApplication.query.filter_by(
+        student_id=current_user.id, job_id=job_id
+    ).first()
+    
+    if existing_application:
+        flash('You have already applied for this job.')
+        return redirect(url_for('student.jobs'))
+    
+    application = JobApplication(student_id=current_user.id, job_id=job_id)
+    db.session.add(application)
+    try:
+        db.session.flush()
+    except IntegrityError:
+        # A concurrent request for the same job got there first.
+        db.session.rollback()
+        flash('You have already applied for this job.')
+        return redirect(url_for('student.jobs'))
+    enqueue('email.application_notification',
+            {'student_id': current_user.id, 'job_id': job.id},
+            priority=10, idempotency_key=f'application-notification:{application.id}')
+    db.session.commit()
+    
+    flash('Successfully applied for the job!')
+    return redirect(url_for('student.dashboard'))
+
+@bp.route('/student/resume', methods=['POST'])
+@login_required
+def upload_resume():
+    if not isinstance(current_user, Student):
+        return redirect(url_for('index'))
+
+    upload = request.files.get('resume')
+    if not upload or not upload.filename:
+        flash('Please choose a resume to upload.')
+        return redirect(url_for('student.dashboard'))
+
+    from app.utils.resumes import ingest_resume
+
+    _, changed = ingest_resume(current_user, upload.read(), upload.filename)
+    flash('Resume uploaded, it will be processed shortly.' if changed
+          else 'This resume is already on file.')
+    return redirect(url_for('student.dashboard'))
+
+@bp.route('/student/events')
+@login_required
+def events():
+    if not isinstance(current_user, Student):
+        return redirect(url_for('index'))
+
+    student = current_user._get_current_object()
+    return Response(stream_with_context(stream(student)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
\ No newline at end of file
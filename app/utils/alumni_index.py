@@ -0,0 +1,127 @@
+# app/utils/alumni_index.py
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from app import db
+from app.models import Alumni, Company, Job, JobApplication
+
+COMPANY_AFFINITY = 2
+BRANCH_AFFINITY = 1
+QUERY_CACHE_SIZE = 256
+
+
+def _key(value):
+    return ' '.join(str(value).lower().split()) if value else None
+
+
+def _tokens(value):
+    return set(re.findall(r'[a-z0-9]+', value.lower())) if value else set()
+
+
+class AlumniIndex:
+    # In-memory inverted index over mentors plus the student -> company edges
+    # of the affinity graph. Rebuilt wholesale every ALUMNI_INDEX_TTL seconds;
+    # a rebuild is a handful of narrow column scans.
+    def __init__(self):
+        self.built_at = time.monotonic()
+        self.ids = []
+        self.by_company = defaultdict(set)
+        self.by_year = defaultdict(set)
+        self.by_branch = defaultdict(set)
+        self.by_position = defaultdict(set)
+        self.company_of = {}
+        self.branch_of = {}
+
+        mentors = db.session.query(
+            Alumni.id, Alumni.company, Alumni.position, Alumni.graduation_year, Alumni.branch
+        ).filter(Alumni.is_mentor.is_(True)).order_by(Alumni.id)
+        for alumni_id, company, position, year, branch in mentors:
+            self.ids.append(alumni_id)
+            self.company_of[alumni_id] = _key(company)
+            self.branch_of[alumni_id] = _key(branch)
+            if company:
+                self.by_company[_key(company)].add(alumni_id)
+            if branch:
+                self.by_branch[_key(branch)].add(alumni_id)
+            self.by_year[year].add(alumni_id)
+            for token in _tokens(position):
+                self.by_position[token].add(alumni_id)
+
+        self.applied_companies = defaultdict(set)
+        applied = db.session.query(JobApplication.student_id, Company.company_name).join(
+            Job, Job.id == JobApplication.job_id
+        ).join(Company, Company.id == Job.company_id).distinct()
+        for student_id, company_name in applied:
+            self.applied_companies[student_id].add(_key(company_name))
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _match(self, company, position, year, branch, applied_by):
+        sets = []
+        if company:
+            sets.append(self.by_company.get(_key(company), set()))
+        if year:
+            sets.append(self.by_year.get(year, set()))
+        if branch:
+            sets.append(self.by_branch.get(_key(branch), set()))
+        for token in _tokens(position):
+            sets.append(self.by_position.get(token, set()))
+        if applied_by is not None:
+            companies = self.applied_companies.get(applied_by, ())
+            sets.append(set().union(*(self.by_company.get(c, ()) for c in companies)))
+        if not sets:
+            return list(self.ids)
+        sets.sort(key=len)
+        return sorted(sets[0].intersection(*sets[1:]))
+
+    def search(self, company=None, position=None, year=None, branch=None,
+               student_id=None, student_branch=None, applied_only=False):
+        # Returns every matching alumni id, most relevant to the student
+        # first. Result lists are cached per query until the next rebuild.
+        query = (_key(company), _key(position), year, _key(branch),
+                 student_id, _key(student_branch), applied_only)
+        with self._lock:
+            if query in self._cache:
+                self._cache.move_to_end(query)
+                return self._cache[query]
+
+        ids = self._match(company, position, year, branch,
+                          student_id if applied_only else None)
+        if student_id is not None:
+            applied = self.applied_companies.get(student_id, set())
+            home = _key(student_branch)
+
+            def affinity(alumni_id):
+                score = COMPANY_AFFINITY * (self.company_of[alumni_id] in applied)
+                score += BRANCH_AFFINITY * (home is not None and self.branch_of[alumni_id] == home)
+                return -score
+
+            ids.sort(key=affinity)
+
+        with self._lock:
+            self._cache[query] = ids
+            if len(self._cache) > QUERY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return ids
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index(ttl):
+    global _index
+    with _index_lock:
+        if _index is None or time.monotonic() - _index.built_at > ttl:
+            _index = AlumniIndex()
+        return _index
+
+
+def search_page(ttl, page, per_page, **filters):
+    ids = get_index(ttl).search(**filters)
+    page_ids = ids[(page - 1) * per_page:page * per_page]
+    rows = {a.id: a for a in Alumni.query.filter(Alumni.id.in_(page_ids))} if page_ids else {}
+    return [rows[i] for i in page_ids if i in rows], len(ids)
@@ -0,0 +1,187 @@
+# app/utils/changes.py
+import json
+import time
+from datetime import datetime
+
+from flask import current_app, has_app_context, has_request_context
+from flask_login import current_user
+from sqlalchemy import bindparam, event, func, inspect, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import (ChangeRecord, ChangeSequence, ConsumerOffset, Job, JobApplication,
+                        Student)
+from app.utils.replicas import RoutingSession
+
+TRACKED = (Job, JobApplication, Student)
+SEQUENCE_BATCH = 5000
+# Never copied into the log.
+EXCLUDED = {'password_hash'}
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _actor():
+    if has_request_context() and current_user.is_authenticated:
+        return int(current_user.get_id())
+    return None
+
+
+def record(table_name, op, row_id, data, tenant=None, actor_id=None):
+    # A row for ChangeRecord.__table__. insert: all columns; update: new
+    # values of the changed ones only (old values are usually expired by the
+    # previous commit, and earlier records in the log hold them); delete: {}.
+    return {'table_name': table_name, 'row_id': row_id, 'op': op,
+            'data': json.dumps(data, separators=(',', ':')), 'actor_id': actor_id,
+            'tenant': tenant, 'created_at': datetime.utcnow()}
+
+
+def _capture(obj, op):
+    state = inspect(obj)
+    data = {}
+    for attr in state.mapper.column_attrs:
+        if attr.key in EXCLUDED:
+            continue
+        if op == 'insert':
+            data[attr.key] = _value(getattr(obj, attr.key))
+        elif op == 'update' and state.attrs[attr.key].history.has_changes():
+            data[attr.key] = _value(getattr(obj, attr.key))
+    if op == 'update' and not data:
+        return None
+    return record(state.mapper.local_table.name, op, obj.id, data, getattr(obj, 'tenant', None))
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _log_changes(session, flush_context):
+    # Runs inside the flush's transaction, so the log commits or rolls back
+    # with the change itself; one multi-row insert per flush.
+    if not has_app_context() or not current_app.config['CHANGE_CAPTURE']:
+        return
+    records = []
+    for objects, op in ((session.new, 'insert'), (session.dirty, 'update'),
+                        (session.deleted, 'delete')):
+        for obj in objects:
+            if isinstance(obj, TRACKED):
+                change = _capture(obj, op)
+                if change is not None:
+                    records.append(change)
+    write(session, records)
+
+
+def write(session, records):
+    # Also for bulk updates that bypass the flush, e.g. offer allocation.
+    if not records or not current_app.config['CHANGE_CAPTURE']:
+        return
+    actor_id = _actor()
+    for change in records:
+        change['actor_id'] = change['actor_id'] or actor_id
+    session.execute(ChangeRecord.__table__.insert(), records)
+
+
+def _lock_sequence():
+    # Takes the sequencer lock (a row lock on Postgres, the write lock on
+    # SQLite) and returns the last position handed out.
+    locked = db.session.execute(update(ChangeSequence).where(ChangeSequence.id == 1)
+                                .values(position=ChangeSequence.position)).rowcount
+    if not locked:
+        try:
+            db.session.add(ChangeSequence(id=1, position=0))
+            db.session.flush()
+        except IntegrityError:
+            # Another process created it first; take the lock on theirs.
+            db.session.rollback()
+            return _lock_sequence()
+    return db.session.query(ChangeSequence.position).filter(ChangeSequence.id == 1).scalar()
+
+
+def sequence(limit=SEQUENCE_BATCH):
+    # Hands positions to records whose transactions have committed, in id
+    # order. A transaction still open now is invisible here and gets a later
+    # position once it commits, so a consumer's offset can never pass a
+    # record it has not seen.
+    head = _lock_sequence()
+    ids = [record_id for record_id, in db.session.query(ChangeRecord.id).filter(
+        ChangeRecord.position.is_(None)).order_by(ChangeRecord.id).limit(limit)]
+    if ids:
+        table = ChangeRecord.__table__
+        db.session.execute(
+            update(table).where(table.c.id == bindparam('record_id'))
+            .values(position=bindparam('new_position')),
+            [{'record_id': record_id, 'new_position': head + i}
+             for i, record_id in enumerate(ids, 1)])
+        head += len(ids)
+        db.session.query(ChangeSequence).filter(ChangeSequence.id == 1).update(
+            {'position': head}, synchronize_session=False)
+    db.session.commit()
+    return head
+
+
+def read(after=0, limit=1000, tables=None):
+    # Records with positions above `after`, in position order, as plain dicts.
+    sequence()
+    query = ChangeRecord.query.filter(ChangeRecord.position > after)
+    if tables:
+        query = query.filter(ChangeRecord.table_name.in_(tables))
+    return [{'offset': change.position, 'table': change.table_name, 'row_id': change.row_id,
+             'op': change.op, 'data': json.loads(change.data), 'actor_id': change.actor_id,
+             'tenant': change.tenant, 'at': change.created_at}
+            for change in query.order_by(ChangeRecord.position).limit(limit)]
+
+
+class Consumer:
+    # A named cursor over the log. Offsets are committed after the handler
+    # returns, so delivery is at-least-once: handlers should be idempotent
+    # (upserts keyed on table and row_id).
+    def __init__(self, name, tables=None):
+        self.name = name
+        self.tables = tables
+
+    @property
+    def position(self):
+        offset = db.session.get(ConsumerOffset, self.name)
+        return offset.position if offset else 0
+
+    def poll(self, limit=1000):
+        return read(self.position, limit, self.tables)
+
+    def commit(self, position):
+        offset = db.session.get(ConsumerOffset, self.name)
+        if offset is None:
+            db.session.add(ConsumerOffset(name=self.name, position=position))
+        else:
+            offset.position = max(offset.position, position)
+        db.session.commit()
+
+    def run(self, handler, batch=500, poll_interval=1.0, burst=False):
+        # handler(records) gets each batch in offset order.
+        processed = 0
+        while True:
+            records = self.poll(batch)
+            if records:
+                handler(records)
+                self.commit(records[-1]['offset'])
+                processed += len(records)
+            elif burst:
+                return processed
+            else:
+                time.sleep(poll_interval)
+
+
+def consumer_lag():
+    head = sequence()
+    return head, {offset.name: head - offset.position for offset in ConsumerOffset.query}
+
+
+def prune(older_than):
+    # Drops records every consumer has passed and that are older than the
+    # retention window. Records not yet sequenced are always kept.
+    oldest = db.session.query(func.min(ConsumerOffset.position)).scalar()
+    query = ChangeRecord.query.filter(ChangeRecord.position.isnot(None),
+                                      ChangeRecord.created_at < datetime.utcnow() - older_than)
+    if oldest is not None:
+        query = query.filter(ChangeRecord.position <= oldest)
+    deleted = query.delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
@@ -0,0 +1,64 @@
+# app/utils/eligibility.py
+from functools import lru_cache
+
+from sqlalchemy import and_, false, not_, or_, select, true
+
+from app.models import PlacementState, Student
+from app.utils.eligibility_rules import COMPARE, job_rule, rule_key
+
+# The rule language lives in eligibility_rules.py; this compiles it to a
+# filter on Student, for queries over the whole student body. The numpy
+# form (eligibility_columns.py) is only imported when a request needs it.
+
+
+def _placed_clause():
+    return Student.id.in_(select(PlacementState.student_id))
+
+
+def to_sql(rule):
+    if 'all' in rule:
+        return and_(true(), *[to_sql(child) for child in rule['all']])
+    if 'any' in rule:
+        return or_(false(), *[to_sql(child) for child in rule['any']])
+    if 'not' in rule:
+        return not_(to_sql(rule['not']))
+    field, op, value = rule['field'], rule['op'], rule['value']
+    if field == 'placed':
+        clause = _placed_clause()
+        return clause if (op == '==') == value else not_(clause)
+    column = getattr(Student, field)
+    if op == 'in':
+        return column.in_(value)
+    if op == 'not_in':
+        return column.notin_(value)
+    return COMPARE[op](column, value)
+
+
+def compile_rule(job):
+    # The job's SQL filter, built once per rules version.
+    return _compile_job(*rule_key(job))
+
+
+@lru_cache(maxsize=4096)
+def _compile_job(job_id, rules_version, min_cgpa, eligible_branches, eligibility):
+    return to_sql(job_rule(min_cgpa, eligible_branches, eligibility))
+
+
+def eligible_students_query(job):
+    return Student.query.filter(compile_rule(job))
+
+
+def placed_student_ids(student_ids=None):
+    query = PlacementState.query.with_entities(PlacementState.student_id)
+    if student_ids is not None:
+        query = query.filter(PlacementState.student_id.in_(student_ids))
+    return {student_id for student_id, in query}
+
+
+def eligible_jobs(student, jobs):
+    # Narrows already-fetched candidate jobs to those whose full rule the
+    # student meets, with one placed lookup for the student.
+    from app.utils.eligibility_columns import StudentColumns, compile_predicate
+
+    columns = StudentColumns([student], placed_student_ids([student.id]))
+    return [job for job in jobs if compile_predicate(job)(columns)[0]]
@@ -0,0 +1,111 @@
+# app/utils/eligibility_columns.py
+from functools import lru_cache
+
+import numpy as np
+
+from app.utils.eligibility_rules import (COMPARE, FIELDS, FLAG, NUMBER, TEXT, job_rule,
+                                         rule_key)
+
+# Vectorized eligibility: rules from eligibility_rules.py compiled to numpy
+# predicates over in-memory student sets. The web app imports this lazily
+# (app/utils/eligibility.eligible_jobs) so NumPy stays off its startup path.
+
+
+class StudentColumns:
+    # Students as parallel arrays. Numbers are float64 with NaN for missing,
+    # text is integer-coded against a per-column vocabulary (-1 for missing),
+    # so every comparison is a single numpy operation.
+    def __init__(self, students, placed=(), key='id'):
+        students = list(students)
+        self.size = len(students)
+        self.ids = [getattr(student, key) for student in students]
+        placed = set(placed)
+        self.numbers, self.codes, self.vocab = {}, {}, {}
+        for field, kind in FIELDS.items():
+            if kind == NUMBER:
+                self.numbers[field] = np.array(
+                    [np.nan if getattr(s, field, None) is None else getattr(s, field)
+                     for s in students], dtype=np.float64)
+            elif kind == TEXT:
+                vocab = self.vocab[field] = {}
+                self.codes[field] = np.array(
+                    [-1 if getattr(s, field, None) is None
+                     else vocab.setdefault(getattr(s, field), len(vocab)) for s in students],
+                    dtype=np.int32)
+        self.placed = np.array([id in placed for id in self.ids], dtype=bool)
+
+    def code(self, field, value):
+        return self.vocab[field].get(value, -2)
+
+
+def _truth(rule):
+    # SQL's three-valued logic as a pair of masks, (true, false); a student
+    # in neither is unknown. "not" swaps the pair, so a missing value stays
+    # unknown under it exactly as NOT NULL does in a WHERE clause.
+    if 'all' in rule or 'any' in rule:
+        children = [_truth(child) for child in rule.get('all', rule.get('any'))]
+        every = 'all' in rule
+
+        def combined(columns):
+            true = np.full(columns.size, every)
+            false = np.full(columns.size, not every)
+            for child in children:
+                child_true, child_false = child(columns)
+                if every:
+                    true &= child_true
+                    false |= child_false
+                else:
+                    true |= child_true
+                    false &= child_false
+            return true, false
+        return combined
+    if 'not' in rule:
+        inner = _truth(rule['not'])
+
+        def negated(columns):
+            true, false = inner(columns)
+            return false, true
+        return negated
+
+    field, op, value = rule['field'], rule['op'], rule['value']
+    kind = FIELDS[field]
+    if kind == FLAG:
+        def flag(columns):
+            match = (columns.placed == value) if op == '==' else (columns.placed != value)
+            return match, ~match
+        return flag
+    listed = op in ('in', 'not_in')
+
+    def leaf(columns):
+        if kind == NUMBER:
+            data = columns.numbers[field]
+            present, operand = ~np.isnan(data), value
+        else:
+            data = columns.codes[field]
+            present = data >= 0
+            operand = ([columns.code(field, v) for v in value] if listed
+                       else columns.code(field, value))
+        if op == 'in':
+            match = np.isin(data, operand)
+        elif op == 'not_in':
+            match = ~np.isin(data, operand)
+        else:
+            match = COMPARE[op](data, operand)
+        return present & match, present & ~match
+    return leaf
+
+
+def to_predicate(rule):
+    # Compiles the tree once into nested closures; calling the result on a
+    # StudentColumns returns a boolean mask of the students it admits.
+    truth = _truth(rule)
+    return lambda columns: truth(columns)[0]
+
+
+def compile_predicate(job, key='id'):
+    return _compile_job(*rule_key(job, key))
+
+
+@lru_cache(maxsize=4096)
+def _compile_job(job_id, rules_version, min_cgpa, eligible_branches, eligibility):
+    return to_predicate(job_rule(min_cgpa, eligible_branches, eligibility))
@@ -0,0 +1,99 @@
+# app/utils/eligibility_rules.py
+import json
+
+# The eligibility rule language. eligibility.py compiles it to SQL and
+# eligibility_columns.py to numpy (for the student views, the event hub and
+# console.py). Standard library only, so neither side pays for the other.
+#
+# Rules are JSON trees stored on Job.eligibility:
+#   {"all": [rule, ...]}   {"any": [rule, ...]}   {"not": rule}
+#   {"field": "backlogs", "op": "<=", "value": 0}
+#   {"field": "gender", "op": "in", "value": ["female"]}
+# 'placed' means the student has a PlacementState row (holds an offer).
+# A job's effective rule is always its min_cgpa and eligible_branches
+# combined with whatever is stored there. A comparison on a missing value
+# is unknown, as NULL is in SQL: neither it nor its "not" matches.
+NUMBER, TEXT, FLAG = 'number', 'text', 'flag'
+FIELDS = {
+    'cgpa': NUMBER,
+    'backlogs': NUMBER,
+    'graduation_year': NUMBER,
+    'branch': TEXT,
+    'gender': TEXT,
+    'placed': FLAG,
+}
+OPS = {
+    NUMBER: {'==', '!=', '<', '<=', '>', '>=', 'in', 'not_in'},
+    TEXT: {'==', '!=', 'in', 'not_in'},
+    FLAG: {'==', '!='},
+}
+COMPARE = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+
+
+def validate(rule):
+    # Raises ValueError with a message fit for a flash() on bad input.
+    if not isinstance(rule, dict) or len(rule) == 0:
+        raise ValueError('Each eligibility rule must be a JSON object.')
+    if 'all' in rule or 'any' in rule:
+        children = rule.get('all', rule.get('any'))
+        if len(rule) != 1 or not isinstance(children, list):
+            raise ValueError('"all" and "any" take a list of rules.')
+        for child in children:
+            validate(child)
+        return
+    if 'not' in rule:
+        if len(rule) != 1:
+            raise ValueError('"not" takes a single rule.')
+        validate(rule['not'])
+        return
+    kind = FIELDS.get(rule.get('field'))
+    if kind is None:
+        raise ValueError(f"Unknown eligibility field {rule.get('field')!r}; "
+                         f"expected one of {', '.join(sorted(FIELDS))}.")
+    op, value = rule.get('op'), rule.get('value')
+    if op not in OPS[kind]:
+        raise ValueError(f"{rule['field']} does not support the {op!r} operator.")
+    values = value if op in ('in', 'not_in') else [value]
+    if op in ('in', 'not_in') and not isinstance(value, list):
+        raise ValueError(f'{op} takes a list of values.')
+    expected = {NUMBER: (int, float), TEXT: (str,), FLAG: (bool,)}[kind]
+    if any(isinstance(v, bool) != (kind == FLAG) or not isinstance(v, expected) for v in values):
+        raise ValueError(f"{rule['field']} values must be "
+                         f"{ {NUMBER: 'numbers', TEXT: 'strings', FLAG: 'true or false'}[kind]}.")
+
+
+def parse(text):
+    if not text or not text.strip():
+        return None
+    try:
+        rule = json.loads(text)
+    except ValueError:
+        raise ValueError('Eligibility rules are not valid JSON.')
+    validate(rule)
+    return rule
+
+
+def job_rule(min_cgpa, eligible_branches, eligibility):
+    branches = [branch.strip() for branch in eligible_branches.split(',') if branch.strip()]
+    rules = [{'field': 'cgpa', 'op': '>=', 'value': min_cgpa},
+             {'field': 'branch', 'op': 'in', 'value': branches}]
+    if eligibility:
+        rules.append(json.loads(eligibility))
+    return {'all': rules}
+
+
+def rule_key(job, key='id'):
+    # Cache key for a job's compiled rule: the rules version plus every
+    # input, so editing min_cgpa or eligible_branches cannot serve a stale
+    # rule. Works for ORM jobs and console.py's plain ones (branch lists).
+    branches = job.eligible_branches
+    if not isinstance(branches, str):
+        branches = ','.join(branches)
+    return getattr(job, key), job.rules_version, job.min_cgpa, branches, job.eligibility
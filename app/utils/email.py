@@ -1,9 +1,24 @@
 # app/utils/email.py
-from flask_mail import Message
-from app import mail
+from flask_mail import Mail, Message
+from app import db
+from app.models import Job, Student
+from app.utils.eligibility import eligible_students_query
+from app.utils.jobs import enqueue_many, task
 from flask import current_app, render_template
 
+mail = Mail()
+
+def init_mail(app):
+    if 'mail' not in app.extensions:
+        mail.init_app(app)
+
+def _mail():
+    init_mail(current_app._get_current_object())
+    return mail
+
 def send_job_notification(student, job):
+    # Before the Message: with no sender it reads the mail extension's default.
+    mailer = _mail()
     msg = Message(
         f'New Job Opportunity: {job.title} at {job.company.company_name}',
         sender=current_app.config['MAIL_USERNAME'],
@@ -11,9 +26,10 @@ def send_job_notification(student, job):
     )
     msg.body = render_template('email/job_notification.txt', student=student, job=job)
     msg.html = render_template('email/job_notification.html', student=student, job=job)
-    mail.send(msg)
+    mailer.send(msg)
 
 def send_application_notification(company, student, job):
+    mailer = _mail()
     msg = Message(
         f'New Application: {student.name} for {job.title}',
         sender=current_app.config['MAIL_USERNAME'],
@@ -23,4 +39,23 @@ def send_application_notification(company, student, job):
                               company=company, student=student, job=job)
     msg.html = render_template('email/application_notification.html', 
                               company=company, student=student, job=job)
-    mail.send(msg)
\ No newline at end of file
+    mailer.send(msg)
+
+@task('email.job_posted')
+def notify_eligible_students(job_id):
+    job = db.session.get(Job, job_id)
+    eligible_students = eligible_students_query(job).with_entities(Student.id)
+    enqueue_many('email.job_notification', (
+        ({'student_id': student_id, 'job_id': job_id}, f'job-notification:{job_id}:{student_id}')
+        for student_id, in eligible_students
+    ))
+    db.session.commit()
+
+@task('email.job_notification')
+def job_notification_task(student_id, job_id):
+    send_job_notification(db.session.get(Student, student_id), db.session.get(Job, job_id))
+
+@task('email.application_notification')
+def application_notification_task(student_id, job_id):
+    job = db.session.get(Job, job_id)
+    send_application_notification(job.company, db.session.get(Student, student_id), job)
\ No newline at end of file
@@ -0,0 +1,206 @@
+# app/utils/events.py
+import itertools
+import json
+import threading
+from collections import defaultdict, deque
+from types import SimpleNamespace
+
+from flask import current_app
+
+from app import db
+from app.utils.eligibility import placed_student_ids
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class Event:
+    # Encoded once at publish time; every subscriber queue holds a reference
+    # to the same string, so fan-out costs no per-connection copies.
+    __slots__ = ('id', 'type', 'data', 'encoded')
+
+    def __init__(self, id, type, data):
+        self.id = id
+        self.type = type
+        self.data = data
+        self.encoded = f'id: {id}\nevent: {type}\ndata: {json.dumps(data)}\n\n'
+
+    def to_dict(self):
+        return {'id': self.id, 'type': self.type, 'data': self.data}
+
+
+class Subscription:
+    # Carries a snapshot of the student's eligibility fields, so job events
+    # can be matched against a full rule without touching the database.
+    def __init__(self, student_id, cgpa, branch, maxsize, backlogs=0, graduation_year=None,
+                 gender=None, placed=False):
+        self.student_id = student_id
+        self.cgpa = cgpa
+        self.branch = branch
+        self.backlogs = backlogs
+        self.graduation_year = graduation_year
+        self.gender = gender
+        self.placed = placed
+        # Bounded: a slow or stalled client loses its oldest events instead of
+        # growing without limit.
+        self.queue = deque(maxlen=maxsize)
+        self.dropped = 0
+        self.cond = threading.Condition()
+
+    def offer(self, event):
+        with self.cond:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1
+            self.queue.append(event)
+            self.cond.notify()
+
+    def get(self, timeout):
+        with self.cond:
+            if not self.queue:
+                self.cond.wait(timeout)
+            return self.queue.popleft() if self.queue else None
+
+
+class Hub:
+    # Per-process fan-out to connected students, indexed so an event only
+    # visits the subscriptions it can concern.
+    def __init__(self):
+        self.by_branch = defaultdict(set)
+        self.by_student = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def subscribe(self, subscription):
+        with self.lock:
+            self.by_branch[subscription.branch].add(subscription)
+            self.by_student[subscription.student_id].add(subscription)
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.by_branch[subscription.branch].discard(subscription)
+            self.by_student[subscription.student_id].discard(subscription)
+            if not self.by_student[subscription.student_id]:
+                del self.by_student[subscription.student_id]
+
+    def dispatch(self, event):
+        with self.lock:
+            if event.type == 'job':
+                min_cgpa = event.data['min_cgpa']
+                targets = [s for branch in event.data['branches']
+                           for s in self.by_branch.get(branch, ()) if s.cgpa >= min_cgpa]
+            else:
+                targets = list(self.by_student.get(event.data['student_id'], ()))
+        if event.type == 'job' and event.data.get('eligibility'):
+            targets = _eligible(event.data, targets)
+        elif event.type == 'status' and event.data['status'] == 'accepted':
+            for subscription in targets:
+                subscription.placed = True
+        for subscription in targets:
+            subscription.offer(event)
+        return len(targets)
+
+
+def _eligible(job, subscriptions):
+    # The branch and cgpa index is the job's base rule; a stored rule tree on
+    # top of it (gender, backlogs, placed, ...) is checked with the compiled
+    # predicate apply_job uses, over one snapshot of the candidates.
+    if not subscriptions:
+        return subscriptions
+    from app.utils.eligibility_columns import StudentColumns, compile_predicate
+
+    rule = SimpleNamespace(id=job['job_id'], rules_version=job['rules_version'],
+                           min_cgpa=job['min_cgpa'], eligible_branches=job['branches'],
+                           eligibility=job['eligibility'])
+    columns = StudentColumns(subscriptions, {s.student_id for s in subscriptions if s.placed},
+                             key='student_id')
+    mask = compile_predicate(rule)(columns)
+    return [subscription for subscription, eligible in zip(subscriptions, mask) if eligible]
+
+
+class LocalBroker:
+    # Single-process stand-in: publishing dispatches straight to the hub.
+    def __init__(self, hub):
+        self.hub = hub
+        self.ids = itertools.count(1)
+
+    def publish(self, type, data):
+        return self.hub.dispatch(Event(next(self.ids), type, data))
+
+
+class RedisBroker:
+    # Shares events between app processes through a Redis pub/sub channel;
+    # each process runs one listener thread that feeds its local hub.
+    def __init__(self, hub, url, channel='launchpad:events'):
+        if redis is None:
+            raise RuntimeError('EVENT_BROKER=redis requires the redis package')
+        self.hub = hub
+        self.client = redis.Redis.from_url(url)
+        self.channel = channel
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{channel: self._receive})
+        pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def _receive(self, message):
+        event = json.loads(message['data'])
+        self.hub.dispatch(Event(event['id'], event['type'], event['data']))
+
+    def publish(self, type, data):
+        event = Event(self.client.incr(self.channel + ':seq'), type, data)
+        self.client.publish(self.channel, json.dumps(event.to_dict()))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            hub = Hub()
+            if current_app.config['EVENT_BROKER'] == 'redis':
+                _broker = RedisBroker(hub, current_app.config['REDIS_URL'])
+            else:
+                _broker = LocalBroker(hub)
+        return _broker
+
+
+def publish_job(job):
+    get_broker().publish('job', {
+        'job_id': job.id,
+        'title': job.title,
+        'company': job.company.company_name,
+        'min_cgpa': job.min_cgpa,
+        'branches': [b.strip() for b in job.eligible_branches.split(',')],
+        'eligibility': job.eligibility,
+        'rules_version': job.rules_version,
+    })
+
+
+def publish_status(application):
+    get_broker().publish('status', {
+        'application_id': application.id,
+        'job_id': application.job_id,
+        'student_id': application.student_id,
+        'status': application.status,
+    })
+
+
+def stream(student, keepalive=15):
+    broker = get_broker()
+    subscription = Subscription(student.id, student.cgpa, student.branch,
+                                current_app.config['EVENT_QUEUE_SIZE'], student.backlogs,
+                                student.graduation_year, student.gender,
+                                bool(placed_student_ids([student.id])))
+    # The stream outlives the request; hand the session's connection back
+    # to the pool now rather than holding it until the client disconnects.
+    db.session.remove()
+    broker.hub.subscribe(subscription)
+    try:
+        yield 'retry: 5000\n\n'
+        while True:
+            event = subscription.get(keepalive)
+            yield event.encoded if event is not None else ': keepalive\n\n'
+    finally:
+        broker.hub.unsubscribe(subscription)
@@ -0,0 +1,191 @@
+# app/utils/jobs.py
+import importlib
+import json
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, or_
+
+from app import db
+from app.models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# Modules whose @task functions a worker must know about.
+TASK_MODULES = ('app.utils.email',)
+RETRY_BASE_SECONDS = 10
+
+TASKS = {}
+
+
+def task(name):
+    def register(func):
+        TASKS[name] = func
+        return func
+    return register
+
+
+def enqueue(name, payload=None, priority=0, idempotency_key=None, delay=0, max_attempts=5):
+    # The job is added to the caller's session, so it is only visible to
+    # workers once the change that caused it commits (and vanishes with it on
+    # rollback).
+    if idempotency_key is not None:
+        existing = BackgroundJob.query.filter_by(idempotency_key=idempotency_key).first()
+        if existing is not None:
+            return existing
+    job = BackgroundJob(
+        task=name,
+        payload=json.dumps(payload or {}),
+        priority=priority,
+        idempotency_key=idempotency_key,
+        max_attempts=max_attempts,
+        run_at=datetime.utcnow() + timedelta(seconds=delay)
+    )
+    db.session.add(job)
+    return job
+
+
+def enqueue_many(name, items, priority=0, max_attempts=5):
+    # items: (payload, idempotency_key) pairs. One lookup per chunk for keys
+    # already queued, then a single bulk insert.
+    items = list(items)
+    keys = [key for _, key in items if key is not None]
+    seen = set()
+    for i in range(0, len(keys), 500):
+        seen.update(key for key, in db.session.query(BackgroundJob.idempotency_key)
+                    .filter(BackgroundJob.idempotency_key.in_(keys[i:i + 500])))
+    now = datetime.utcnow()
+    rows = [{'task': name, 'payload': json.dumps(payload), 'priority': priority,
+             'status': 'queued', 'attempts': 0, 'max_attempts': max_attempts,
+             'idempotency_key': key, 'run_at': now, 'created_at': now}
+            for payload, key in items if key is None or key not in seen]
+    db.session.bulk_insert_mappings(BackgroundJob, rows)
+    return len(rows)
+
+
+def _ready(now):
+    # Queued and due, or running under a lease that has expired (the worker
+    # holding it died).
+    return or_(
+        and_(BackgroundJob.status == 'queued', BackgroundJob.run_at <= now),
+        and_(BackgroundJob.status == 'running', BackgroundJob.locked_until < now)
+    )
+
+
+def claim(worker_id, lease=60, limit=10):
+    now = datetime.utcnow()
+    lease_values = {
+        'status': 'running',
+        'locked_by': worker_id,
+        'locked_until': now + timedelta(seconds=lease),
+        'attempts': BackgroundJob.attempts + 1,
+        'started_at': now,
+    }
+    candidates = db.session.query(BackgroundJob.id).filter(_ready(now)).order_by(
+        BackgroundJob.priority.desc(), BackgroundJob.run_at
+    )
+
+    if db.engine.dialect.name == 'postgresql':
+        ids = [job_id for job_id, in candidates.with_for_update(skip_locked=True).limit(limit)]
+        if ids:
+            db.session.query(BackgroundJob).filter(BackgroundJob.id.in_(ids)).update(
+                lease_values, synchronize_session=False)
+    else:
+        # No SKIP LOCKED: each claim is a conditional UPDATE that re-checks
+        # readiness, so when two workers race for a row only one matches it.
+        ids = []
+        for job_id, in candidates.limit(limit * 4).all():
+            claimed = db.session.query(BackgroundJob).filter(
+                BackgroundJob.id == job_id, _ready(now)
+            ).update(lease_values, synchronize_session=False)
+            if claimed:
+                ids.append(job_id)
+                if len(ids) == limit:
+                    break
+    db.session.commit()
+    if not ids:
+        return []
+    return BackgroundJob.query.filter(BackgroundJob.id.in_(ids)).order_by(
+        BackgroundJob.priority.desc(), BackgroundJob.run_at).all()
+
+
+def execute(job, worker_id):
+    job_id, name, attempts, max_attempts = job.id, job.task, job.attempts, job.max_attempts
+    started = time.perf_counter()
+    try:
+        TASKS[name](**json.loads(job.payload))
+    except Exception:
+        db.session.rollback()
+        now = datetime.utcnow()
+        values = {'last_error': traceback.format_exc()[-4000:],
+                  'locked_by': None, 'locked_until': None}
+        if attempts >= max_attempts:
+            values.update(status='failed', finished_at=now)
+        else:
+            values.update(status='queued',
+                          run_at=now + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (attempts - 1)))
+        logger.warning('job %s (%s) failed on attempt %s/%s', job_id, name, attempts, max_attempts)
+    else:
+        values = {'status': 'done', 'finished_at': datetime.utcnow(),
+                  'locked_by': None, 'locked_until': None}
+        logger.info('job %s (%s) done in %.3fs', job_id, name, time.perf_counter() - started)
+
+    # Only the current lease holder may settle the job; if our lease expired
+    # and another worker reclaimed it, this update matches nothing.
+    db.session.query(BackgroundJob).filter_by(id=job_id, locked_by=worker_id).update(
+        values, synchronize_session=False)
+    db.session.commit()
+
+
+def work(worker_id=None, lease=60, batch=10, poll_interval=1.0, burst=False):
+    for module in TASK_MODULES:
+        importlib.import_module(module)
+    worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+    processed = 0
+    while True:
+        jobs = claim(worker_id, lease, batch)
+        if not jobs:
+            if burst:
+                return processed
+            time.sleep(poll_interval)
+            continue
+        for job in jobs:
+            execute(job, worker_id)
+            processed += 1
+
+
+def _percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def queue_stats(window=timedelta(hours=1)):
+    now = datetime.utcnow()
+    counts = dict(db.session.query(BackgroundJob.status, func.count(BackgroundJob.id))
+                  .group_by(BackgroundJob.status))
+    ready, oldest = db.session.query(func.count(BackgroundJob.id), func.min(BackgroundJob.run_at)) \
+        .filter(BackgroundJob.status == 'queued', BackgroundJob.run_at <= now).one()
+
+    recent = db.session.query(BackgroundJob.run_at, BackgroundJob.started_at,
+                              BackgroundJob.finished_at).filter(
+        BackgroundJob.status == 'done', BackgroundJob.finished_at >= now - window
+    ).order_by(BackgroundJob.finished_at.desc()).limit(10000).all()
+    waits = [(started - run_at).total_seconds() for run_at, started, _ in recent]
+    runs = [(finished - started).total_seconds() for _, started, finished in recent]
+
+    return {
+        'counts': counts,
+        'ready': ready,
+        'oldest_ready_age': (now - oldest).total_seconds() if oldest else 0.0,
+        'completed_in_window': len(recent),
+        'wait_p50': _percentile(waits, 50),
+        'wait_p95': _percentile(waits, 95),
+        'run_p50': _percentile(runs, 50),
+        'run_p95': _percentile(runs, 95),
+    }
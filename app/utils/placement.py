@@ -0,0 +1,206 @@
+# app/utils/placement.py
+import heapq
+from collections import defaultdict, deque
+
+from flask import current_app
+from sqlalchemy import event, inspect
+
+from app import db
+from app.models import Job, JobApplication, PlacementState, Student, current_tenant
+from app.utils import changes
+from app.utils.replicas import RoutingSession
+
+TIERS = ('regular', 'dream', 'super_dream')
+TIER_RANK = {tier: rank for rank, tier in enumerate(TIERS)}
+CHUNK = 500
+
+
+def allowed(placed_tier, job_tier, policy=None):
+    # placed_tier is None for an unplaced student. Under 'tiered' a placed
+    # student may only move up a tier; under 'one_offer' not at all.
+    if placed_tier is None:
+        return True
+    if (policy or current_app.config['PLACEMENT_POLICY']) == 'one_offer':
+        return False
+    return TIER_RANK[job_tier] > placed_tier
+
+
+def _state(session, tenant, student_id):
+    return session.get(PlacementState, {'tenant': tenant, 'student_id': student_id})
+
+
+def may_apply(student_id, job):
+    state = _state(db.session, job.tenant, student_id)
+    return allowed(state.tier if state else None, job.tier)
+
+
+def _record_offer(session, application):
+    job = application.job or session.get(Job, application.job_id)
+    rank = TIER_RANK[job.tier]
+    tenant = application.tenant or current_tenant()
+    state = _state(session, tenant, application.student_id)
+    if state is None:
+        session.add(PlacementState(tenant=tenant, student_id=application.student_id,
+                                   tier=rank, job_id=job.id, offers=1))
+    else:
+        _add_offer(state, rank, job.id)
+
+
+def _add_offer(state, rank, job_id):
+    state.offers += 1
+    if rank >= state.tier:
+        state.tier, state.job_id = rank, job_id
+
+
+def _revoke_offer(session, application):
+    # Rare (an offer withdrawn), so recompute this one student from their
+    # other accepted applications.
+    state = _state(session, application.tenant or current_tenant(), application.student_id)
+    if state is None:
+        return
+    others = session.query(Job.id, Job.tier).join(JobApplication).filter(
+        JobApplication.student_id == application.student_id,
+        JobApplication.status == 'accepted',
+        JobApplication.id != application.id
+    ).all()
+    if not others:
+        session.delete(state)
+        return
+    best_id, best_tier = max(others, key=lambda row: TIER_RANK[row.tier])
+    state.tier, state.job_id, state.offers = TIER_RANK[best_tier], best_id, len(others)
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _track_offers(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, JobApplication):
+            continue
+        history = inspect(obj).attrs.status.history
+        if not history.has_changes():
+            continue
+        old = history.deleted[0] if history.deleted else None
+        if obj.status == 'accepted' and old != 'accepted':
+            _record_offer(session, obj)
+        elif old == 'accepted' and obj.status != 'accepted':
+            _revoke_offer(session, obj)
+
+
+def rebuild_state():
+    # Recomputes every placement row of the current season from accepted
+    # applications, for backfills and after bulk status updates.
+    PlacementState.query.filter(PlacementState.tenant == current_tenant()).delete(
+        synchronize_session=False)
+    states = {}
+    for student_id, job_id, tier in db.session.query(
+            JobApplication.student_id, Job.id, Job.tier).join(Job).filter(
+            JobApplication.status == 'accepted'):
+        rank = TIER_RANK[tier]
+        state = states.get(student_id)
+        if state is None:
+            states[student_id] = {'tenant': current_tenant(), 'student_id': student_id,
+                                  'tier': rank, 'job_id': job_id, 'offers': 1}
+        else:
+            state['offers'] += 1
+            if rank >= state['tier']:
+                state['tier'], state['job_id'] = rank, job_id
+    db.session.bulk_insert_mappings(PlacementState, list(states.values()))
+    db.session.commit()
+    return len(states)
+
+
+def match(preferences, rankings, openings):
+    # Student-proposing deferred acceptance (Gale-Shapley with capacities).
+    #   preferences: student -> jobs, most wanted first
+    #   rankings:    job -> {student: rank}, lower is better
+    #   openings:    job -> number of offers it can make
+    # Each job holds a max-heap of its current tentative offers, so a proposal
+    # costs O(log openings) and the whole run O(applications log openings).
+    # The result is stable: no student and job both prefer each other to
+    # what they ended up with.
+    held = defaultdict(list)
+    next_choice = dict.fromkeys(preferences, 0)
+    free = deque(preferences)
+    while free:
+        student = free.popleft()
+        choices = preferences[student]
+        if next_choice[student] >= len(choices):
+            continue
+        job = choices[next_choice[student]]
+        next_choice[student] += 1
+        rank = rankings[job][student]
+        offers = held[job]
+        if openings[job] <= 0:
+            free.append(student)
+        elif len(offers) < openings[job]:
+            heapq.heappush(offers, (-rank, student))
+        elif -offers[0][0] > rank:
+            _, rejected = heapq.heapreplace(offers, (-rank, student))
+            free.append(rejected)
+        else:
+            free.append(student)
+    return {student: job for job, offers in held.items() for _, student in offers}
+
+
+def allocate(job_ids=None, dry_run=False):
+    # Batch offer round over shortlisted applications. Students only
+    # propose to jobs the placement policy lets them take, and each ends up
+    # with at most one new offer.
+    jobs = db.session.query(Job.id, Job.tier, Job.compensation, Job.openings)
+    if job_ids:
+        jobs = jobs.filter(Job.id.in_(job_ids))
+    jobs = {row.id: row for row in jobs}
+    placed = dict(db.session.query(PlacementState.student_id, PlacementState.tier))
+
+    rows = db.session.query(
+        JobApplication.id, JobApplication.student_id, JobApplication.job_id,
+        JobApplication.preference, JobApplication.company_rank, Student.cgpa
+    ).join(Student, Student.id == JobApplication.student_id).filter(
+        JobApplication.status == 'shortlisted', JobApplication.job_id.in_(list(jobs))
+    ).all()
+
+    policy = current_app.config['PLACEMENT_POLICY']
+    job_keys = {job.id: (-TIER_RANK[job.tier], -job.compensation) for job in jobs.values()}
+    application_ids, choices, candidates = {}, defaultdict(list), defaultdict(list)
+    for application_id, student_id, job_id, preference, company_rank, cgpa in rows:
+        tier = placed.get(student_id)
+        if tier is not None and not allowed(tier, jobs[job_id].tier, policy):
+            continue
+        application_ids[student_id, job_id] = application_id
+        choices[student_id].append((preference is None, preference or 0, *job_keys[job_id], job_id))
+        candidates[job_id].append((company_rank is None, company_rank or 0, -cgpa, student_id))
+
+    preferences = {student: [choice[-1] for choice in sorted(options)]
+                   for student, options in choices.items()}
+    rankings = {job_id: {entry[-1]: rank for rank, entry in enumerate(sorted(entries))}
+                for job_id, entries in candidates.items()}
+    matches = match(preferences, rankings, {job_id: job.openings for job_id, job in jobs.items()})
+
+    if not dry_run:
+        _save_offers([(application_ids[pair], *pair) for pair in matches.items()], jobs)
+    return matches, len(preferences) - len(matches)
+
+
+def _save_offers(accepted, jobs):
+    # Bulk counterpart of _track_offers for a whole allocation round:
+    # accepted is (application_id, student_id, job_id) triples.
+    for i in range(0, len(accepted), CHUNK):
+        chunk = accepted[i:i + CHUNK]
+        db.session.query(JobApplication).filter(
+            JobApplication.id.in_([application_id for application_id, _, _ in chunk])
+        ).update({'status': 'accepted'}, synchronize_session=False)
+        changes.write(db.session, [
+            changes.record('job_application', 'update', application_id,
+                           {'status': 'accepted'}, tenant=current_tenant())
+            for application_id, _, _ in chunk])
+        states = {state.student_id: state for state in PlacementState.query.filter(
+            PlacementState.student_id.in_([student_id for _, student_id, _ in chunk]))}
+        new = []
+        for _, student_id, job_id in chunk:
+            rank = TIER_RANK[jobs[job_id].tier]
+            if student_id in states:
+                _add_offer(states[student_id], rank, job_id)
+            else:
+                new.append({'tenant': current_tenant(), 'student_id': student_id, 'tier': rank,
+                            'job_id': job_id, 'offers': 1})
+        db.session.bulk_insert_mappings(PlacementState, new)
+    db.session.commit()
@@ -0,0 +1,207 @@
+# app/utils/ratelimit.py
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, has_app_context, make_response, request
+from flask_login import current_user
+from sqlalchemy import event
+
+from app.utils.replicas import RoutingSession
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class MemoryBackend:
+    # Per-process buckets. Least recently used keys are evicted past
+    # `max_keys`; an evicted bucket simply starts full again.
+    def __init__(self, max_keys=100000):
+        self.buckets = OrderedDict()
+        self.max_keys = max_keys
+        self.lock = threading.Lock()
+
+    def take(self, key, rate, burst, now=None):
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            tokens, updated = self.buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+
+class RedisBackend:
+    # Shared buckets for multi-process and multi-node deployments; the refill
+    # and take happen atomically in one Lua script.
+    SCRIPT = """
+    local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or burst
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url):
+        if redis is None:
+            raise RuntimeError('RATELIMIT_BACKEND=redis requires the redis package')
+        self.client = redis.Redis.from_url(url)
+        self.script = self.client.register_script(self.SCRIPT)
+
+    def take(self, key, rate, burst, now=None):
+        now = time.time() if now is None else now
+        allowed, tokens = self.script(keys=['ratelimit:' + key], args=[rate, burst, now])
+        return bool(allowed), 0.0 if allowed else (1 - float(tokens)) / rate
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if current_app.config['RATELIMIT_BACKEND'] == 'redis':
+                _backend = RedisBackend(current_app.config['REDIS_URL'])
+            else:
+                _backend = MemoryBackend()
+        return _backend
+
+
+def _retry_response(status, message, retry_after):
+    response = make_response(message, status)
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def rate_limit(name, user_key=None, methods=('POST',)):
+    # Limits come from RATE_LIMITS[name] as {'user': (rate/s, burst),
+    # 'ip': (rate/s, burst)}. The per-IP bucket should be generous: a whole
+    # hostel can sit behind one campus NAT address. Only `methods` are
+    # counted, so rendering the login form is free.
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config['RATELIMIT_ENABLED'] or request.method not in methods:
+                return view(*args, **kwargs)
+            limits = current_app.config['RATE_LIMITS'][name]
+            user = user_key() if user_key else (
+                current_user.get_id() if current_user.is_authenticated else None)
+            keys = [('ip', request.remote_addr)]
+            if user:
+                keys.append(('user', user))
+            backend = get_backend()
+            for scope, value in keys:
+                allowed, retry_after = backend.take(f'{name}:{scope}:{value}', *limits[scope])
+                if not allowed:
+                    return _retry_response(429, 'Too many requests, please retry shortly.',
+                                           retry_after)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class AdmissionController:
+    # Watches database write latency (EWMA of flush-to-commit time). While
+    # it is under `threshold` writes pass straight through; above it, at
+    # most `concurrency` writes run at once, up to `max_queue` more wait up
+    # to `queue_timeout` for a slot, and the rest are shed immediately.
+    def __init__(self, threshold, concurrency, max_queue, queue_timeout, alpha=0.2):
+        self.threshold = threshold
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.alpha = alpha
+        self.latency = 0.0
+        self.waiting = 0
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self.lock:
+            self.latency += self.alpha * (seconds - self.latency)
+
+    def retry_after(self):
+        return self.latency * (self.waiting + 1)
+
+    def acquire(self):
+        # None: shed. Otherwise admitted, and True means a slot is held that
+        # must be given back with release().
+        if self.latency <= self.threshold:
+            return False
+        with self.lock:
+            if self.waiting >= self.max_queue:
+                return None
+            self.waiting += 1
+        try:
+            return True if self.slots.acquire(timeout=self.queue_timeout) else None
+        finally:
+            with self.lock:
+                self.waiting -= 1
+
+    def release(self):
+        self.slots.release()
+
+
+def get_admission():
+    app = current_app._get_current_object()
+    controller = app.extensions.get('admission')
+    if controller is None:
+        config = app.config
+        controller = app.extensions['admission'] = AdmissionController(
+            config['ADMISSION_LATENCY_THRESHOLD'], config['ADMISSION_CONCURRENCY'],
+            config['ADMISSION_MAX_QUEUE'], config['ADMISSION_QUEUE_TIMEOUT'])
+    return controller
+
+
+def admit_write(view):
+    # Only POSTs write; a view that also renders its form on GET serves that
+    # without waiting for a slot.
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method != 'POST':
+            return view(*args, **kwargs)
+        controller = get_admission()
+        holds_slot = controller.acquire()
+        if holds_slot is None:
+            return _retry_response(503, 'The portal is busy, please retry shortly.',
+                                   controller.retry_after())
+        try:
+            return view(*args, **kwargs)
+        finally:
+            if holds_slot:
+                controller.release()
+    return wrapper
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _write_started(session, flush_context, instances):
+    session.info.setdefault('write_started', time.perf_counter())
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _write_finished(session):
+    started = session.info.pop('write_started', None)
+    if started is not None and has_app_context() and 'admission' in current_app.extensions:
+        current_app.extensions['admission'].observe(time.perf_counter() - started)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _write_abandoned(session):
+    session.info.pop('write_started', None)
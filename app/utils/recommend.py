@@ -0,0 +1,141 @@
+# app/utils/recommend.py
+import os
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+from sqlalchemy import func
+
+from app import db
+from app.models import Job, JobApplication, Student
+from app.utils.resumes import all_resume_texts
+
+TEXT_DIM = 512
+# Columns after the text block: normalised compensation, popularity.
+FEATURE_DIM = TEXT_DIM + 2
+
+RESUME_WEIGHT = 1.0
+HISTORY_WEIGHT = 0.5
+COMPENSATION_WEIGHT = 0.3
+POPULARITY_WEIGHT = 0.1
+
+_TOKEN = re.compile(r'[a-z0-9+#.]+')
+
+
+def hash_text(texts, dim=TEXT_DIM):
+    # Hashing-trick bag of words with log term frequency and L2 norm. crc32
+    # keeps buckets stable across processes, unlike the salted hash().
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        counts = defaultdict(int)
+        for token in _TOKEN.findall((text or '').lower()):
+            counts[zlib.crc32(token.encode()) % dim] += 1
+        if counts:
+            cols = np.fromiter(counts.keys(), dtype=np.int64)
+            matrix[row, cols] = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _scale(values):
+    values = np.log1p(np.asarray(values, dtype=np.float32))
+    top = values.max() if len(values) else 0
+    return values / top if top > 0 else values
+
+
+def build_features(resume_texts=None):
+    resume_texts = resume_texts or {}
+
+    jobs = db.session.query(Job.id, Job.description, Job.compensation).order_by(Job.id).all()
+    job_ids = np.array([j.id for j in jobs], dtype=np.int64)
+    popularity = dict(db.session.query(JobApplication.job_id, func.count(JobApplication.id))
+                      .group_by(JobApplication.job_id).all())
+
+    job_matrix = np.zeros((len(jobs), FEATURE_DIM), dtype=np.float32)
+    job_matrix[:, :TEXT_DIM] = hash_text([j.description for j in jobs])
+    job_matrix[:, TEXT_DIM] = _scale([j.compensation for j in jobs])
+    job_matrix[:, TEXT_DIM + 1] = _scale([popularity.get(j.id, 0) for j in jobs])
+
+    student_ids = np.array([s for s, in db.session.query(Student.id).order_by(Student.id)],
+                           dtype=np.int64)
+    student_matrix = np.zeros((len(student_ids), FEATURE_DIM), dtype=np.float32)
+    student_matrix[:, :TEXT_DIM] = RESUME_WEIGHT * hash_text(
+        [resume_texts.get(int(s), '') for s in student_ids])
+    student_matrix[:, TEXT_DIM] = COMPENSATION_WEIGHT
+    student_matrix[:, TEXT_DIM + 1] = POPULARITY_WEIGHT
+
+    # Past applications: add the mean text vector of the jobs a student
+    # applied to, scattered over the whole cohort in one np.add.at call.
+    applications = db.session.query(JobApplication.student_id, JobApplication.job_id).all()
+    if applications and len(jobs):
+        pairs = np.array(applications, dtype=np.int64)
+        s_rows = np.searchsorted(student_ids, pairs[:, 0])
+        j_rows = np.searchsorted(job_ids, pairs[:, 1])
+        history = np.zeros((len(student_ids), TEXT_DIM), dtype=np.float32)
+        np.add.at(history, s_rows, job_matrix[j_rows, :TEXT_DIM])
+        counts = np.bincount(s_rows, minlength=len(student_ids)).astype(np.float32)
+        np.divide(history, counts[:, None], out=history, where=counts[:, None] > 0)
+        student_matrix[:, :TEXT_DIM] += HISTORY_WEIGHT * history
+
+    return job_ids, job_matrix, student_ids, student_matrix
+
+
+def write_features(path):
+    job_ids, job_matrix, student_ids, student_matrix = build_features(all_resume_texts())
+    # float16 halves the file and the resident size; scores only need ranking
+    # precision.
+    tmp_path = path + '.tmp.npz'
+    np.savez_compressed(tmp_path, job_ids=job_ids, job_matrix=job_matrix.astype(np.float16),
+                        student_ids=student_ids,
+                        student_matrix=student_matrix.astype(np.float16))
+    os.replace(tmp_path, path)
+    return len(job_ids), len(student_ids)
+
+
+class FeatureStore:
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.job_ids = data['job_ids']
+            self.job_matrix = data['job_matrix'].astype(np.float32)
+            self.student_ids = data['student_ids']
+            self.student_matrix = data['student_matrix'].astype(np.float32)
+
+    def _row(self, ids, value):
+        i = np.searchsorted(ids, value)
+        return i if i < len(ids) and ids[i] == value else None
+
+    def top_k(self, student_id, job_ids, k=10):
+        # Jobs posted after the last batch run have no features yet; they are
+        # returned after the ranked ones, newest first by id.
+        candidates = np.asarray(sorted(job_ids), dtype=np.int64)
+        student_row = self._row(self.student_ids, student_id)
+        if student_row is None or not len(self.job_ids):
+            return [int(j) for j in candidates[::-1][:k]]
+
+        rows = np.searchsorted(self.job_ids, candidates).clip(max=len(self.job_ids) - 1)
+        known = self.job_ids[rows] == candidates
+        scores = self.job_matrix[rows[known]] @ self.student_matrix[student_row]
+        ranked = candidates[known]
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            ranked, scores = ranked[top], scores[top]
+        ranked = list(ranked[np.argsort(-scores, kind='stable')])
+        unknown = list(candidates[~known][::-1])
+        return [int(j) for j in (ranked + unknown)[:k]]
+
+
+_store = {}
+
+
+def get_store(path):
+    # Reload only when the nightly batch has replaced the file.
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _store.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = _store[path] = (mtime, FeatureStore(path))
+    return cached[1]
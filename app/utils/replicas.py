@@ -0,0 +1,63 @@
+# app/utils/replicas.py
+import itertools
+import time
+from functools import wraps
+
+from flask import g, has_app_context, session
+from flask_sqlalchemy import SQLAlchemy, SignallingSession
+from sqlalchemy import event, orm
+
+# Deliberately free of `from app import ...`: app/__init__.py builds `db`
+# from the classes here.
+
+
+class RoutingSession(SignallingSession):
+    # Reads inside a @read_only view go to the replicas round-robin; flushes,
+    # and anything after the request has written, stay on the primary.
+    def __init__(self, db, **options):
+        self.db = db
+        super().__init__(db, **options)
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (not self._flushing and has_app_context()
+                and g.get('db_use_replica') and not g.get('db_wrote')):
+            replicas = self.app.extensions['db_replicas']
+            if replicas:
+                return self.db.get_engine(self.app, bind=next(replicas))
+        return super().get_bind(mapper, clause)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_write(session, flush_context):
+    if has_app_context():
+        g.db_wrote = True
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+
+def read_only(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Read-your-writes: a user who just wrote keeps reading from the
+        # primary until replicas have had time to catch up.
+        if session.get('db_primary_until', 0) < time.time():
+            g.db_use_replica = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def init_app(app):
+    names = [f'replica{i}' for i in range(len(app.config['DATABASE_REPLICA_URLS']))]
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    binds.update(zip(names, app.config['DATABASE_REPLICA_URLS']))
+    app.config['SQLALCHEMY_BINDS'] = binds
+    app.extensions['db_replicas'] = itertools.cycle(names) if names else None
+
+    @app.after_request
+    def stick_to_primary(response):
+        if g.get('db_wrote'):
+            session['db_primary_until'] = time.time() + app.config['READ_YOUR_WRITES_SECONDS']
+        return response
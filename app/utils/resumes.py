@@ -0,0 +1,159 @@
+# app/utils/resumes.py
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from flask import current_app
+from pypdf import PdfReader
+
+from app import db
+from app.models import ResumeText
+
+try:
+    import boto3
+except ImportError:
+    boto3 = None
+
+
+class LocalStorage:
+    # Also the stand-in for object storage in development: same key layout,
+    # files under a local directory instead of a bucket.
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, key):
+        with open(self._path(key), 'rb') as f:
+            return f.read()
+
+    def exists(self, key):
+        return os.path.exists(self._path(key))
+
+
+class S3Storage:
+    def __init__(self, bucket):
+        if boto3 is None:
+            raise RuntimeError('RESUME_STORAGE=s3 requires boto3 to be installed')
+        self.bucket = bucket
+        self.client = boto3.client('s3')
+
+    def put(self, key, data):
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data)
+
+    def get(self, key):
+        return self.client.get_object(Bucket=self.bucket, Key=key)['Body'].read()
+
+    def exists(self, key):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.ClientError:
+            return False
+        return True
+
+
+def get_storage():
+    config = current_app.config
+    if config['RESUME_STORAGE'] == 's3':
+        return S3Storage(config['RESUME_BUCKET'])
+    return LocalStorage(config['RESUME_STORAGE_PATH'])
+
+
+def extract_text(data):
+    # Runs in a worker process, so it must stay a pure bytes -> text function.
+    if data[:5] == b'%PDF-':
+        reader = PdfReader(io.BytesIO(data))
+        return '\n'.join(page.extract_text() or '' for page in reader.pages)
+    return data.decode('utf-8', errors='replace')
+
+
+_pool = None
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=current_app.config['RESUME_WORKERS'])
+    return _pool
+
+
+def _store_result(app, student_id, content_hash, future):
+    with app.app_context():
+        row = db.session.get(ResumeText, student_id)
+        # A newer upload may have replaced this one while it was parsing.
+        if row is None or row.content_hash != content_hash:
+            return
+        try:
+            row.text = future.result()
+            row.status, row.error = 'ready', None
+        except Exception as e:
+            row.status, row.error = 'failed', str(e)
+        db.session.commit()
+
+
+def ingest_resume(student, data, filename):
+    content_hash = hashlib.sha256(data).hexdigest()
+    row = db.session.get(ResumeText, student.id)
+    if row is not None and row.content_hash == content_hash and row.status != 'failed':
+        return row, False
+
+    # Keys are content-addressed, so re-uploading the same file is a no-op
+    # for storage as well as for parsing.
+    ext = os.path.splitext(filename)[1].lower() or '.bin'
+    key = f'{student.id}/{content_hash}{ext}'
+    storage = get_storage()
+    if not storage.exists(key):
+        storage.put(key, data)
+
+    if row is None:
+        row = ResumeText(student_id=student.id)
+        db.session.add(row)
+    row.storage_key = key
+    row.content_hash = content_hash
+    row.status, row.text, row.error = 'pending', None, None
+    student.resume_url = key
+    db.session.commit()
+
+    app = current_app._get_current_object()
+    student_id = student.id
+    future = _get_pool().submit(extract_text, data)
+    future.add_done_callback(lambda f: _store_result(app, student_id, content_hash, f))
+    return row, True
+
+
+def reprocess_pending(stale_after=timedelta(minutes=10)):
+    # Only uploads whose parse was lost, e.g. the web process restarted
+    # before it finished. Newer pending rows may still be in flight there,
+    # and failed rows stay failed until the student uploads again.
+    app = current_app._get_current_object()
+    storage = get_storage()
+    pool = _get_pool()
+    pending = {}
+    for row in ResumeText.query.filter(ResumeText.status == 'pending',
+                                       ResumeText.updated_at < datetime.utcnow() - stale_after):
+        future = pool.submit(extract_text, storage.get(row.storage_key))
+        pending[future] = (row.student_id, row.content_hash)
+    for future in as_completed(pending):
+        _store_result(app, *pending[future], future)
+    return len(pending)
+
+
+def get_resume_text(student_id):
+    row = db.session.get(ResumeText, student_id)
+    return row.text if row is not None and row.status == 'ready' else None
+
+
+def all_resume_texts():
+    return dict(db.session.query(ResumeText.student_id, ResumeText.text)
+                .filter(ResumeText.status == 'ready'))
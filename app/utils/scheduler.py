@@ -0,0 +1,166 @@
+# app/utils/scheduler.py
+import random
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from app import db
+from app.models import InterviewBooking, InterviewSlot, JobApplication
+
+
+class StudentCalendar:
+    # Conflict index: per-student sorted interval lists, so an overlap check
+    # is a bisect plus two neighbour comparisons instead of a scan.
+    def __init__(self, gap=timedelta(0)):
+        self.gap = gap
+        self.starts = defaultdict(list)
+        self.ends = defaultdict(list)
+
+    def is_free(self, student_id, start, end):
+        starts = self.starts[student_id]
+        ends = self.ends[student_id]
+        i = bisect_left(starts, start)
+        if i > 0 and ends[i - 1] + self.gap > start:
+            return False
+        if i < len(starts) and starts[i] < end + self.gap:
+            return False
+        return True
+
+    def book(self, student_id, start, end):
+        starts = self.starts[student_id]
+        i = bisect_left(starts, start)
+        starts.insert(i, start)
+        self.ends[student_id].insert(i, end)
+
+
+def schedule(slots, applicants, calendar=None):
+    # slots: (slot_id, job_id, start, end, remaining_capacity)
+    # applicants: (application_id, student_id, job_id)
+    # Returns ([(application_id, slot_id)], [unassigned application_id]).
+    calendar = calendar or StudentCalendar()
+
+    open_slots = defaultdict(list)
+    remaining = {}
+    for slot_id, job_id, start, end, capacity in slots:
+        if capacity > 0:
+            open_slots[job_id].append((start, end, slot_id))
+            remaining[slot_id] = capacity
+    for job_slots in open_slots.values():
+        job_slots.sort()
+
+    by_job = defaultdict(list)
+    load = defaultdict(int)
+    for application_id, student_id, job_id in applicants:
+        by_job[job_id].append((application_id, student_id))
+        load[student_id] += 1
+
+    # Most contended jobs first (fewest seats per applicant), and within a job
+    # the students with the most interviews to fit in go first.
+    def pressure(job_id):
+        seats = sum(remaining[s] for _, _, s in open_slots.get(job_id, ()))
+        return seats / len(by_job[job_id])
+
+    assigned, unassigned = [], []
+    for job_id in sorted(by_job, key=pressure):
+        job_slots = open_slots.get(job_id, [])
+        queue = sorted(by_job[job_id], key=lambda a: -load[a[1]])
+        for application_id, student_id in queue:
+            chosen = None
+            for index, (start, end, slot_id) in enumerate(job_slots):
+                if calendar.is_free(student_id, start, end):
+                    chosen = index
+                    break
+            if chosen is None:
+                unassigned.append(application_id)
+                continue
+            start, end, slot_id = job_slots[chosen]
+            calendar.book(student_id, start, end)
+            assigned.append((application_id, slot_id))
+            remaining[slot_id] -= 1
+            if remaining[slot_id] == 0:
+                del job_slots[chosen]
+    return assigned, unassigned
+
+
+def schedule_shortlisted(job_ids=None, gap_minutes=0):
+    slot_query = InterviewSlot.query
+    if job_ids:
+        slot_query = slot_query.filter(InterviewSlot.job_id.in_(job_ids))
+    slot_rows = slot_query.all()
+    slot_by_id = {s.id: s for s in slot_rows}
+
+    booked = db.session.query(
+        InterviewBooking.slot_id, InterviewBooking.student_id,
+        InterviewSlot.start_time, InterviewSlot.end_time
+    ).join(InterviewSlot).all()
+
+    calendar = StudentCalendar(timedelta(minutes=gap_minutes))
+    used = defaultdict(int)
+    for slot_id, student_id, start, end in booked:
+        calendar.book(student_id, start, end)
+        used[slot_id] += 1
+
+    slots = [(s.id, s.job_id, s.start_time, s.end_time, s.capacity - used[s.id])
+             for s in slot_rows]
+
+    pending = JobApplication.query.outerjoin(
+        InterviewBooking, InterviewBooking.application_id == JobApplication.id
+    ).filter(
+        JobApplication.status == 'shortlisted',
+        InterviewBooking.id.is_(None)
+    )
+    if job_ids:
+        pending = pending.filter(JobApplication.job_id.in_(job_ids))
+    applicants = pending.with_entities(
+        JobApplication.id, JobApplication.student_id, JobApplication.job_id
+    ).all()
+
+    assigned, unassigned = schedule(slots, applicants, calendar)
+
+    student_of = {a[0]: a[1] for a in applicants}
+    db.session.bulk_insert_mappings(InterviewBooking, [
+        {'slot_id': slot_id, 'application_id': application_id,
+         'student_id': student_of[application_id], 'created_at': datetime.utcnow()}
+        for application_id, slot_id in assigned
+    ])
+    db.session.commit()
+    return assigned, unassigned
+
+
+def synthetic_drive(n_students=5000, n_companies=200, applications_per_student=20,
+                    slot_minutes=30, slot_capacity=4, seed=0):
+    # Benchmark fixture: one job per company, interview day split into
+    # back-to-back slots sized to fit every applicant.
+    rng = random.Random(seed)
+    day = datetime(2024, 11, 15, 9, 0)
+    applicants = []
+    per_job = defaultdict(int)
+    application_id = 0
+    for student_id in range(n_students):
+        for job_id in rng.sample(range(n_companies), applications_per_student):
+            applicants.append((application_id, student_id, job_id))
+            per_job[job_id] += 1
+            application_id += 1
+
+    slots = []
+    slot_id = 0
+    for job_id in range(n_companies):
+        n_slots = -(-per_job[job_id] // slot_capacity) + 2
+        offset = rng.randrange(0, 4) * slot_minutes
+        for i in range(n_slots):
+            start = day + timedelta(minutes=offset + i * slot_minutes)
+            slots.append((slot_id, job_id, start, start + timedelta(minutes=slot_minutes),
+                          slot_capacity))
+            slot_id += 1
+    return slots, applicants
+
+
+if __name__ == '__main__':
+    import time
+
+    slots, applicants = synthetic_drive()
+    started = time.perf_counter()
+    assigned, unassigned = schedule(slots, applicants)
+    elapsed = time.perf_counter() - started
+    print(f'{len(applicants)} applications, {len(slots)} slots: '
+          f'{len(assigned)} assigned, {len(unassigned)} unassigned in {elapsed:.2f}s')
@@ -0,0 +1,37 @@
+# app/utils/startup.py
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+BOOT = 'from app import create_app; create_app()'
+
+
+def _run(code, env=None, flags=()):
+    environ = dict(os.environ, **(env or {}))
+    return subprocess.run([sys.executable, *flags, '-c', code], env=environ,
+                          capture_output=True, text=True, check=True)
+
+
+def import_profile(env=None, top=15):
+    # `python -X importtime` in a fresh interpreter, rolled up to top-level
+    # packages by self time so nested imports are not double counted.
+    stderr = _run(BOOT, env, ('-X', 'importtime')).stderr
+    totals = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        totals[name.strip().split('.')[0]] += int(self_us)
+    return sorted(totals.items(), key=lambda item: -item[1])[:top]
+
+
+def cold_start(env=None, runs=5):
+    # Median wall time to start an interpreter and build the app.
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        _run(BOOT, env)
+        samples.append(time.perf_counter() - started)
+    return sorted(samples)[len(samples) // 2]
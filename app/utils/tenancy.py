@@ -0,0 +1,125 @@
+# app/utils/tenancy.py
+import os
+import re
+from contextlib import contextmanager
+
+from flask import current_app, has_app_context
+from sqlalchemy import create_engine, event, orm, select
+
+from app import db
+from app.models import (Company, InstituteMixin, InterviewBooking, InterviewSlot, Job,
+                        JobApplication, PlacementState, Student, TenantMixin, User,
+                        current_institute, current_tenant)
+from app.utils.replicas import RoutingSession
+
+ARCHIVE_CHUNK = 1000
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _scope_to_tenant(execute_state):
+    # Every ORM SELECT on a tenant-keyed model (including relationship loads)
+    # only sees the current tenant's rows, and institute-keyed models (students)
+    # only the current institute's, whatever the season. Pass
+    # .execution_options(all_tenants=True) to opt out, e.g. for archival.
+    if (not execute_state.is_select or not has_app_context()
+            or execute_state.execution_options.get('all_tenants')):
+        return
+    tenant, institute = current_tenant(), current_institute()
+    execute_state.statement = execute_state.statement.options(
+        orm.with_loader_criteria(TenantMixin, lambda cls: cls.tenant == tenant,
+                                 include_aliases=True),
+        orm.with_loader_criteria(InstituteMixin, lambda cls: cls.institute == institute,
+                                 include_aliases=True)
+    )
+
+
+def init_app(app):
+    app.config['TENANT'] = f"{app.config['INSTITUTE_DOMAIN']}:{app.config['PLACEMENT_SEASON']}"
+
+
+def tenant_for(season, institute=None):
+    return f"{institute or current_app.config['INSTITUTE_DOMAIN']}:{season}"
+
+
+def archive_url(tenant):
+    url = current_app.config['ARCHIVE_DATABASE_URL'].format(
+        tenant=re.sub(r'[^A-Za-z0-9]+', '_', tenant))
+    if url.startswith('sqlite:///'):
+        os.makedirs(os.path.dirname(url[len('sqlite:///'):]) or '.', exist_ok=True)
+    return url
+
+
+def _copy(source, target, table, whereclause):
+    # Streams rows across in chunks so a whole season never sits in memory.
+    statement = table.select().where(whereclause).execution_options(stream_results=True)
+    result = source.execute(statement)
+    while True:
+        rows = result.fetchmany(ARCHIVE_CHUNK)
+        if not rows:
+            break
+        target.execute(table.insert(), [dict(row._mapping) for row in rows])
+
+
+def archive_season(tenant):
+    # Moves a finished season's jobs, applications and interview schedule
+    # into their own database, together with snapshots of the students and
+    # companies they reference, so the archive is queryable on its own.
+    # Student rows stay in the hot database: they remain users, and are only
+    # scoped by institute. Refuses to run once the hot rows are gone, so a
+    # rerun cannot replace a good archive with an empty one.
+    if tenant == current_app.config['TENANT']:
+        raise ValueError('Refusing to archive the current season')
+    hot = db.session.execute(
+        select(Job.id).where(Job.tenant == tenant).union(
+            select(JobApplication.id).where(JobApplication.tenant == tenant)
+        ).limit(1).execution_options(all_tenants=True)
+    ).first()
+    if hot is None:
+        raise ValueError(f'No rows for {tenant} in the hot database; '
+                         'it is already archived or never existed')
+
+    job_ids = select(Job.id).where(Job.tenant == tenant)
+    students = select(JobApplication.student_id).where(JobApplication.tenant == tenant)
+    companies = select(Job.company_id).where(Job.tenant == tenant)
+    slots = select(InterviewSlot.id).where(InterviewSlot.job_id.in_(job_ids))
+
+    tables = [
+        (User.__table__, User.id.in_(students) | User.id.in_(companies)),
+        (Student.__table__, Student.id.in_(students)),
+        (Company.__table__, Company.id.in_(companies)),
+        (Job.__table__, Job.tenant == tenant),
+        (JobApplication.__table__, JobApplication.tenant == tenant),
+        (PlacementState.__table__, PlacementState.tenant == tenant),
+        (InterviewSlot.__table__, InterviewSlot.job_id.in_(job_ids)),
+        (InterviewBooking.__table__, InterviewBooking.slot_id.in_(slots)),
+    ]
+
+    # Rebuilt from scratch, so re-running after a failed delete is safe.
+    engine = create_engine(archive_url(tenant))
+    db.Model.metadata.drop_all(engine, tables=[table for table, _ in tables])
+    db.Model.metadata.create_all(engine, tables=[table for table, _ in tables])
+    with engine.begin() as target:
+        source = db.session.connection()
+        for table, whereclause in tables:
+            _copy(source, target, table, whereclause)
+
+    # Children first. The archive has committed by now; if this fails the
+    # hot rows are still in place.
+    counts = {}
+    for table, whereclause in reversed(tables[3:]):
+        counts[table.name] = db.session.execute(table.delete().where(whereclause)).rowcount
+    db.session.commit()
+    engine.dispose()
+    return counts
+
+
+@contextmanager
+def archive_session(tenant):
+    # A plain Session on the archive: no tenant scope, no replica routing.
+    engine = create_engine(archive_url(tenant))
+    session = orm.Session(bind=engine)
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
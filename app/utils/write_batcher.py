@@ -0,0 +1,127 @@
+# app/utils/write_batcher.py
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from flask import current_app
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import JobApplication
+from app.utils.jobs import enqueue_many
+
+logger = logging.getLogger(__name__)
+
+CREATED = 'created'
+DUPLICATE = 'duplicate'
+
+
+class ApplicationBatcher:
+    # One writer thread per process owns every application insert. Requests
+    # queue (student_id, job_id) and wait on a Future; the writer drains
+    # whatever arrived within `interval` seconds (up to `max_batch`) and
+    # commits it in a single transaction, so a burst of N applies costs a
+    # handful of SQLite write locks instead of N. Each Future resolves to
+    # (CREATED, application_id) or (DUPLICATE, None).
+    def __init__(self, app, interval=0.005, max_batch=256):
+        self.app = app
+        self.interval = interval
+        self.max_batch = max_batch
+        self.queue = queue.Queue()
+        self.pid = os.getpid()
+        self.thread = threading.Thread(target=self._run, name='application-writer', daemon=True)
+        self.thread.start()
+
+    def submit(self, student_id, job_id, tenant):
+        future = Future()
+        self.queue.put((student_id, job_id, tenant, future))
+        return future
+
+    def _collect(self):
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            with self.app.app_context():
+                try:
+                    self._commit(batch)
+                except IntegrityError:
+                    # Lost a race with a write from another process; settle
+                    # each application on its own so only the clash is a
+                    # duplicate.
+                    db.session.rollback()
+                    for item in batch:
+                        self._commit_one(item)
+                except Exception as exc:
+                    db.session.rollback()
+                    logger.exception('application batch of %s failed', len(batch))
+                    for *_, future in batch:
+                        future.set_exception(exc)
+                finally:
+                    db.session.remove()
+
+    def _commit(self, batch):
+        pairs = {(student_id, job_id) for student_id, job_id, _, _ in batch}
+        existing = set(db.session.query(JobApplication.student_id, JobApplication.job_id)
+                       .filter(tuple_(JobApplication.student_id, JobApplication.job_id).in_(pairs))
+                       .execution_options(all_tenants=True))
+
+        created, results = {}, []
+        for student_id, job_id, tenant, future in batch:
+            key = (student_id, job_id)
+            if key in existing or key in created:
+                results.append((future, None))
+                continue
+            created[key] = JobApplication(student_id=student_id, job_id=job_id, tenant=tenant)
+            results.append((future, created[key]))
+        db.session.add_all(created.values())
+        db.session.flush()
+        enqueue_many('email.application_notification', (
+            ({'student_id': application.student_id, 'job_id': application.job_id},
+             f'application-notification:{application.id}')
+            for application in created.values()
+        ), priority=10)
+        db.session.commit()
+
+        for future, application in results:
+            future.set_result((CREATED, application.id) if application is not None
+                              else (DUPLICATE, None))
+
+    def _commit_one(self, item):
+        try:
+            self._commit([item])
+        except IntegrityError:
+            db.session.rollback()
+            item[3].set_result((DUPLICATE, None))
+        except Exception as exc:
+            db.session.rollback()
+            item[3].set_exception(exc)
+
+
+_lock = threading.Lock()
+
+
+def get_batcher():
+    app = current_app._get_current_object()
+    with _lock:
+        batcher = app.extensions.get('application_batcher')
+        # A forked worker inherits the object but not its thread.
+        if batcher is None or batcher.pid != os.getpid():
+            batcher = app.extensions['application_batcher'] = ApplicationBatcher(
+                app, app.config['APPLICATION_BATCH_INTERVAL'], app.config['APPLICATION_BATCH_SIZE'])
+        return batcher
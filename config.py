@@ -7,6 +7,9 @@ load_dotenv()
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///launchpad.db'
+    DATABASE_REPLICA_URLS = [url for url in (os.environ.get('DATABASE_REPLICA_URLS') or '').split(',')
+                             if url]
+    READ_YOUR_WRITES_SECONDS = int(os.environ.get('READ_YOUR_WRITES_SECONDS') or 10)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     MAIL_SERVER = os.environ.get('MAIL_SERVER') or 'smtp.gmail.com'
     MAIL_PORT = int(os.environ.get('MAIL_PORT') or 587)
@@ -14,31 +17,35 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     INSTITUTE_DOMAIN = os.environ.get('INSTITUTE_DOMAIN') or 'institute.edu'
-
-# app/__init__.py
-from flask import Flask
-from flask_sqlalchemy import SQLAlchemy
-from flask_login import LoginManager
-from flask_mail import Mail
-from config import Config
-
-db = SQLAlchemy()
-login_manager = LoginManager()
-mail = Mail()
-
-def create_app():
-    app = Flask(__name__)
-    app.config.from_object(Config)
-
-    db.init_app(app)
-    login_manager.init_app(app)
-    mail.init_app(app)
-
-    login_manager.login_view = 'auth.login'
-
-    from app.routes import auth, student, company
-    app.register_blueprint(auth.bp)
-    app.register_blueprint(student.bp)
-    app.register_blueprint(company.bp)
-
-    return app
\ No newline at end of file
+    PLACEMENT_SEASON = os.environ.get('PLACEMENT_SEASON') or '2024-25'
+    ARCHIVE_DATABASE_URL = os.environ.get('ARCHIVE_DATABASE_URL') or 'sqlite:///archive/{tenant}.db'
+    LAZY_LOADING = (os.environ.get('LAZY_LOADING') or '1') == '1'
+    RECOMMENDATIONS_PATH = os.environ.get('RECOMMENDATIONS_PATH') or 'recommendations.npz'
+    MAX_CONTENT_LENGTH = 5 * 1024 * 1024
+    RESUME_STORAGE = os.environ.get('RESUME_STORAGE') or 'local'
+    RESUME_STORAGE_PATH = os.environ.get('RESUME_STORAGE_PATH') or 'resumes'
+    RESUME_BUCKET = os.environ.get('RESUME_BUCKET')
+    RESUME_WORKERS = int(os.environ.get('RESUME_WORKERS') or 2)
+    ALUMNI_INDEX_TTL = int(os.environ.get('ALUMNI_INDEX_TTL') or 300)
+    ALUMNI_PAGE_SIZE = 20
+    EVENT_BROKER = os.environ.get('EVENT_BROKER') or 'local'
+    EVENT_QUEUE_SIZE = 100
+    REDIS_URL = os.environ.get('REDIS_URL') or 'redis://localhost:6379/0'
+    RATELIMIT_ENABLED = (os.environ.get('RATELIMIT_ENABLED') or '1') == '1'
+    RATELIMIT_BACKEND = os.environ.get('RATELIMIT_BACKEND') or 'memory'
+    # (tokens per second, burst) per user and per client IP
+    RATE_LIMITS = {
+        'apply': {'user': (0.5, 5), 'ip': (50, 200)},
+        'login': {'user': (0.1, 5), 'ip': (10, 100)},
+    }
+    ADMISSION_LATENCY_THRESHOLD = float(os.environ.get('ADMISSION_LATENCY_THRESHOLD') or 0.25)
+    ADMISSION_CONCURRENCY = 4
+    ADMISSION_MAX_QUEUE = 32
+    ADMISSION_QUEUE_TIMEOUT = 1.0
+    # Coalesce application inserts into group commits (mainly for SQLite)
+    APPLICATION_WRITE_BATCHING = (os.environ.get('APPLICATION_WRITE_BATCHING') or '0') == '1'
+    APPLICATION_BATCH_INTERVAL = float(os.environ.get('APPLICATION_BATCH_INTERVAL') or 0.005)
+    APPLICATION_BATCH_SIZE = 256
+    # 'tiered': placed students may only apply to higher tiers; 'one_offer': not at all
+    PLACEMENT_POLICY = os.environ.get('PLACEMENT_POLICY') or 'tiered'
+    CHANGE_CAPTURE = (os.environ.get('CHANGE_CAPTURE') or '1') == '1'
@@ -3,17 +3,24 @@ import json
 import os
 from typing import List, Dict, Optional
 
+from app.utils.eligibility_columns import StudentColumns, compile_predicate
+
 class User:
     def __init__(self, username: str, password: str):
         self.username = username
         self.password = password
 
 class Student(User):
-    def __init__(self, username: str, password: str, roll_number: str, cgpa: float, branch: str):
+    def __init__(self, username: str, password: str, roll_number: str, cgpa: float, branch: str,
+                 backlogs: int = 0, graduation_year: Optional[int] = None,
+                 gender: Optional[str] = None):
         super().__init__(username, password)
         self.roll_number = roll_number
         self.cgpa = cgpa
         self.branch = branch
+        self.backlogs = backlogs
+        self.graduation_year = graduation_year
+        self.gender = gender
         self.applied_jobs: List[str] = []  # List of job IDs
 
 class Company(User):
@@ -25,7 +32,7 @@ class Company(User):
 class Job:
     def __init__(self, job_id: str, company_name: str, role: str, compensation: float, 
                  min_cgpa: float, eligible_branches: List[str], interview_process: str,
-                 interview_date: datetime):
+                 interview_date: datetime, eligibility: Optional[dict] = None):
         self.job_id = job_id
         self.company_name = company_name
         self.role = role
@@ -34,6 +41,9 @@ class Job:
         self.eligible_branches = eligible_branches
         self.interview_process = interview_process
         self.interview_date = interview_date
+        # Extra rule tree in the same language as the web app's Job.eligibility
+        self.eligibility = json.dumps(eligibility) if eligibility else None
+        self.rules_version = 1
         self.applicants: List[str] = []  # List of student usernames
 
 class PlacementPortal:
@@ -41,6 +51,7 @@ class PlacementPortal:
         self.students: Dict[str, Student] = {}
         self.companies: Dict[str, Company] = {}
         self.jobs: Dict[str, Job] = {}
+        self.placed: set = set()  # usernames of students holding an offer
         self.load_data()
 
     def load_data(self):
@@ -89,18 +100,32 @@ class PlacementPortal:
             return company
         return None
 
+    def _columns(self, students: List[Student]) -> StudentColumns:
+        return StudentColumns(students, self.placed, key="username")
+
+    def is_eligible(self, student: Student, job: Job) -> bool:
+        return bool(compile_predicate(job, key="job_id")(self._columns([student]))[0])
+
     def get_eligible_jobs(self, student: Student) -> List[Job]:
-        eligible_jobs = []
-        for job in self.jobs.values():
-            if (student.cgpa >= job.min_cgpa and 
-                student.branch in job.eligible_branches):
-                eligible_jobs.append(job)
-        return eligible_jobs
+        columns = self._columns([student])
+        return [job for job in self.jobs.values()
+                if compile_predicate(job, key="job_id")(columns)[0]]
+
+    def get_eligible_students(self, job_ids: List[str]) -> Dict[str, List[Student]]:
+        # One columnar snapshot of every student, then one vectorized
+        # predicate per job.
+        students = list(self.students.values())
+        columns = self._columns(students)
+        eligible = {}
+        for job_id in job_ids:
+            mask = compile_predicate(self.jobs[job_id], key="job_id")(columns)
+            eligible[job_id] = [students[i] for i in mask.nonzero()[0]]
+        return eligible
 
     def apply_for_job(self, student: Student, job_id: str) -> bool:
         if job_id in self.jobs:
             job = self.jobs[job_id]
-            if job_id not in student.applied_jobs:
+            if job_id not in student.applied_jobs and self.is_eligible(student, job):
                 student.applied_jobs.append(job_id)
                 job.applicants.append(student.username)
                 return True
@@ -1,9 +1,7 @@
 # run.py
-from app import create_app, db
+from app import create_app
 
 app = create_app()
 
 if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
     app.run(debug=True)
\ No newline at end of file
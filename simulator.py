@@ -0,0 +1,565 @@
+import argparse
+import heapq
+import itertools
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from console import Company, PlacementPortal, Student
+
+BRANCHES = ["Computer Science", "Electronics", "Mechanical", "Civil", "Chemical"]
+
+
+@dataclass
+class Request:
+    arrival: float
+    kind: str  # 'login', 'view' or 'apply'
+    student: int
+    job: Optional[str] = None
+
+
+@dataclass
+class Served:
+    request: Request
+    service: float
+    write: float = 0.0  # portion of service that needs the DB writer lock
+
+
+def poisson_burst(rate: float, duration: float, rng: random.Random) -> List[float]:
+    # Homogeneous Poisson arrivals at `rate` per second for `duration` seconds.
+    times, t = [], rng.expovariate(rate)
+    while t < duration:
+        times.append(t)
+        t += rng.expovariate(rate)
+    return times
+
+
+def deadline_rush(total: int, duration: float, rng: random.Random,
+                  steepness: float = 4.0) -> List[float]:
+    # `total` arrivals whose rate grows exponentially towards the deadline.
+    # Inverse-CDF sampling of the density proportional to exp(steepness * t / duration).
+    scale = math.expm1(steepness)
+    return sorted(duration * math.log1p(rng.random() * scale) / steepness
+                  for _ in range(total))
+
+
+ARRIVALS: Dict[str, Callable[..., List[float]]] = {
+    "burst": lambda args, rng: poisson_burst(args.students / args.duration, args.duration, rng),
+    "deadline": lambda args, rng: deadline_rush(args.students, args.duration, rng),
+}
+
+
+def build_sessions(arrivals: List[float], n_students: int, job_ids: List[str],
+                   rng: random.Random, views: int = 2, think_time: float = 2.0) -> List[Request]:
+    # Each arrival is one student session: login, browse, then apply.
+    requests = []
+    for i, t in enumerate(arrivals):
+        student = i % n_students
+        requests.append(Request(t, "login", student))
+        for _ in range(views):
+            t += rng.expovariate(1 / think_time)
+            requests.append(Request(t, "view", student))
+        t += rng.expovariate(1 / think_time)
+        requests.append(Request(t, "apply", student, rng.choice(job_ids)))
+    requests.sort(key=lambda r: r.arrival)
+    return requests
+
+
+class PortalBackend:
+    # Runs requests against console.py's in-memory PlacementPortal.
+    # The portal has no database, so each apply is charged a fixed `commit_cost`
+    # under the writer lock to stand in for a SQLite commit.
+
+    def __init__(self, n_students: int, n_jobs: int, commit_cost: float, rng: random.Random):
+        self.portal = PlacementPortal()
+        self.commit_cost = commit_cost
+        self.usernames = []
+        for i in range(n_students):
+            student = Student(f"student{i}", "pw", f"R{i:05d}", round(rng.uniform(6, 10), 2),
+                              rng.choice(BRANCHES))
+            self.portal.students[student.username] = student
+            self.usernames.append(student.username)
+        company = Company("dreamco", "pw", "DreamCo")
+        self.portal.companies[company.username] = company
+        for _ in range(n_jobs):
+            self.portal.post_job(company, {
+                "role": "Engineer", "compensation": 2000000, "min_cgpa": 6.0,
+                "eligible_branches": BRANCHES, "interview_process": "Interview",
+                "interview_date": datetime(2024, 11, 15),
+            })
+        self.job_ids = list(company.posted_jobs)
+
+    def serve(self, request: Request) -> Served:
+        username = self.usernames[request.student]
+        started = time.perf_counter()
+        if request.kind == "login":
+            self.portal.student_login(username, "pw")
+        elif request.kind == "view":
+            self.portal.get_eligible_jobs(self.portal.students[username])
+        else:
+            self.portal.apply_for_job(self.portal.students[username], request.job)
+            elapsed = time.perf_counter() - started
+            return Served(request, elapsed + self.commit_cost, self.commit_cost)
+        return Served(request, time.perf_counter() - started)
+
+
+class ModelBackend:
+    # Runs requests against the Flask app's models on a real database.
+
+    def __init__(self, n_students: int, n_jobs: int, database_url: str, rng: random.Random,
+                 reset: bool = False):
+        import os
+        os.environ["DATABASE_URL"] = database_url
+        from sqlalchemy import inspect
+        from app import create_app, db
+        from app.models import Company as CompanyModel, Job, Student as StudentModel
+
+        self.db = db
+        self.app = create_app()
+        self.context = self.app.app_context()
+        self.context.push()
+        # Seeding starts from an empty schema; never wipe a database that
+        # might be a real one unless asked to.
+        if inspect(db.engine).get_table_names() and not reset:
+            raise SystemExit(f"{database_url} already has tables; pass --reset to drop them "
+                             "and reseed it")
+        db.drop_all()
+        db.create_all()
+
+        company = CompanyModel(email="hr@dreamco.com", company_name="DreamCo")
+        company.set_password("pw")
+        db.session.add(company)
+        db.session.flush()
+        # One shared hash keeps seeding fast; logins still pay a full check.
+        password_hash = company.password_hash
+        db.session.bulk_insert_mappings(StudentModel, [
+            {"email": f"student{i}@institute.edu", "password_hash": password_hash,
+             "user_type": "student", "roll_number": f"R{i:05d}", "name": f"Student {i}",
+             "cgpa": round(rng.uniform(6, 10), 2), "branch": rng.choice(BRANCHES)}
+            for i in range(n_students)
+        ], return_defaults=True)
+        for _ in range(n_jobs):
+            db.session.add(Job(company_id=company.id, title="Engineer", description="Engineer",
+                               compensation=2000000, min_cgpa=6.0,
+                               eligible_branches=",".join(BRANCHES),
+                               interview_process="Interview",
+                               interview_date=datetime(2024, 11, 15)))
+        db.session.commit()
+        self.job_ids = [str(job_id) for job_id, in db.session.query(Job.id)]
+        self.student_ids = [student_id for student_id, in
+                            db.session.query(StudentModel.id).order_by(StudentModel.id)]
+
+    def serve(self, request: Request) -> Served:
+        from app.models import Job, JobApplication, Student as StudentModel
+
+        session = self.db.session
+        student_id = self.student_ids[request.student]
+        started = time.perf_counter()
+        if request.kind == "login":
+            student = StudentModel.query.filter_by(
+                email=f"student{request.student}@institute.edu").first()
+            student.check_password("pw")
+        elif request.kind == "view":
+            student = session.get(StudentModel, student_id)
+            Job.query.filter(Job.min_cgpa <= student.cgpa,
+                             Job.eligible_branches.contains(student.branch)).all()
+        else:
+            job_id = int(request.job)
+            exists = JobApplication.query.filter_by(student_id=student_id, job_id=job_id).first()
+            if exists is None:
+                session.add(JobApplication(student_id=student_id, job_id=job_id))
+                committed = time.perf_counter()
+                session.commit()
+                write = time.perf_counter() - committed
+                session.remove()
+                return Served(request, time.perf_counter() - started, write)
+        session.remove()
+        return Served(request, time.perf_counter() - started)
+
+
+@dataclass
+class Report:
+    requests: int
+    makespan: float
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    lock_waits: List[float] = field(default_factory=list)
+    email_backlog_max: int = 0
+    email_backlog_end: int = 0
+    email_drained_at: float = 0.0
+
+    @staticmethod
+    def percentile(values: List[float], p: float) -> float:
+        if not values:
+            return 0.0
+        values = sorted(values)
+        return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+    def render(self) -> str:
+        lines = [f"requests: {self.requests}  makespan: {self.makespan:.2f}s  "
+                 f"throughput: {self.requests / self.makespan if self.makespan else 0:.1f} req/s"]
+        for kind, values in sorted(self.latencies.items()):
+            lines.append(f"  {kind:<6} p50 {self.percentile(values, 50) * 1000:8.1f}ms  "
+                         f"p95 {self.percentile(values, 95) * 1000:8.1f}ms  "
+                         f"p99 {self.percentile(values, 99) * 1000:8.1f}ms  "
+                         f"max {max(values) * 1000:8.1f}ms")
+        lines.append(f"db lock waits: {sum(w > 0 for w in self.lock_waits)} of "
+                     f"{len(self.lock_waits)} writes  total {sum(self.lock_waits):.2f}s  "
+                     f"p99 {self.percentile(self.lock_waits, 99) * 1000:.1f}ms")
+        lines.append(f"email backlog: max {self.email_backlog_max}  "
+                     f"at end of load {self.email_backlog_end}  "
+                     f"drained at {self.email_drained_at:.1f}s")
+        return "\n".join(lines)
+
+
+def simulate(served: List[Served], workers: int, email_senders: int,
+             email_time: float) -> Report:
+    # Replay measured service times through a virtual worker pool.
+    #
+    # Requests are taken FCFS by `workers` request workers; the write part of a
+    # request also holds the single database writer lock. Every successful apply
+    # queues one notification email for `email_senders` SMTP workers.
+    free_at = [0.0] * workers
+    heapq.heapify(free_at)
+    lock_free_at = 0.0
+    report = Report(requests=len(served), makespan=0.0)
+    emails: List[float] = []
+
+    for item in served:
+        request = item.request
+        start = max(request.arrival, heapq.heappop(free_at))
+        end = start + item.service - item.write
+        if item.write:
+            wait = max(0.0, lock_free_at - end)
+            report.lock_waits.append(wait)
+            end += wait + item.write
+            lock_free_at = end
+            emails.append(end)
+        heapq.heappush(free_at, end)
+        report.latencies.setdefault(request.kind, []).append(end - request.arrival)
+        report.makespan = max(report.makespan, end)
+
+    senders = [0.0] * email_senders
+    sent: List[float] = []
+    for queued in emails:
+        done = max(queued, heapq.heappop(senders)) + email_time
+        heapq.heappush(senders, done)
+        sent.append(done)
+    if sent:
+        events = sorted([(t, 1) for t in emails] + [(t, -1) for t in sent])
+        backlog = 0
+        for t, delta in events:
+            backlog += delta
+            report.email_backlog_max = max(report.email_backlog_max, backlog)
+        report.email_backlog_end = sum(t > report.makespan for t in sent)
+        report.email_drained_at = max(sent)
+    return report
+
+
+def fanout_test(subscribers: int, events: int, consumers: int, queue_size: int,
+                interval: float, rng: random.Random) -> str:
+    # Load test for the event hub behind /student/events: `subscribers`
+    # connected students drained by `consumers` writer threads, receiving
+    # `events` new-job postings published every `interval` seconds.
+    import threading
+    from app.utils.events import Hub, LocalBroker, Subscription
+
+    broker = LocalBroker(Hub())
+    subs = [Subscription(i, round(rng.uniform(6, 10), 2), rng.choice(BRANCHES), queue_size)
+            for i in range(subscribers)]
+    for sub in subs:
+        broker.hub.subscribe(sub)
+
+    published: Dict[int, float] = {}
+    latencies: List[List[float]] = [[] for _ in range(consumers)]
+    done = threading.Event()
+
+    def drain(slot: int) -> None:
+        mine = subs[slot::consumers]
+        while True:
+            idle = True
+            for sub in mine:
+                while sub.queue:
+                    event = sub.queue.popleft()
+                    latencies[slot].append(time.perf_counter() - published[event.id])
+                    idle = False
+            if idle:
+                if done.is_set():
+                    return
+                time.sleep(0.001)
+
+    threads = [threading.Thread(target=drain, args=(i,)) for i in range(consumers)]
+    for thread in threads:
+        thread.start()
+    dispatch, recipients = [], 0
+    for i in range(events):
+        published[i + 1] = started = time.perf_counter()
+        recipients += broker.publish("job", {"job_id": i, "title": "Engineer",
+                                             "company": "DreamCo", "min_cgpa": rng.uniform(6, 9),
+                                             "branches": rng.sample(BRANCHES, 2)})
+        dispatch.append(time.perf_counter() - started)
+        time.sleep(interval)
+    done.set()
+    for thread in threads:
+        thread.join()
+
+    delivered = [value for values in latencies for value in values]
+    percentile = Report.percentile
+    return "\n".join([
+        f"fan-out: {events} events to {subscribers} subscribers, {recipients} deliveries",
+        f"  dispatch per event  p50 {percentile(dispatch, 50) * 1000:.2f}ms  "
+        f"p99 {percentile(dispatch, 99) * 1000:.2f}ms",
+        f"  publish -> consumer p50 {percentile(delivered, 50) * 1000:.2f}ms  "
+        f"p99 {percentile(delivered, 99) * 1000:.2f}ms  max {max(delivered, default=0) * 1000:.2f}ms",
+        f"  dropped by bounded queues: {sum(sub.dropped for sub in subs)}",
+    ])
+
+
+def replica_test(students: int, jobs: int, replicas: int, readers: int, seconds: float,
+                 rng: random.Random) -> str:
+    # Read throughput of the @read_only views' eligible-jobs query while one
+    # writer commits applications, first all on the primary, then with reads
+    # routed to `replicas` SQLite copies standing in for streaming replicas.
+    import os
+    import multiprocessing
+    import shutil
+    import tempfile
+
+    directory = tempfile.mkdtemp(prefix="launchpad-replicas-")
+    primary = os.path.join(directory, "primary.db")
+    replica_files = [os.path.join(directory, f"replica{i}.db") for i in range(replicas)]
+    os.environ["DATABASE_REPLICA_URLS"] = ",".join(f"sqlite:///{path}" for path in replica_files)
+    backend = ModelBackend(students, jobs, f"sqlite:///{primary}", rng)
+    backend.db.session.remove()
+    for path in replica_files:
+        shutil.copyfile(primary, path)
+
+    from flask import g
+    from app.models import Job, JobApplication, Student as StudentModel
+
+    app, db = backend.app, backend.db
+    routing = app.extensions["db_replicas"]
+
+    def fresh_connections() -> None:
+        # Forked children must not share the parent's SQLite connections.
+        for bind in [None] + list(app.config["SQLALCHEMY_BINDS"]):
+            db.get_engine(app, bind).dispose()
+
+    def reader(slot: int, stop, reads) -> None:
+        fresh_connections()
+        local = random.Random(slot)
+        with app.test_request_context():
+            g.db_use_replica = True
+            while not stop.is_set():
+                student = db.session.get(StudentModel, local.choice(backend.student_ids))
+                Job.query.filter(Job.min_cgpa <= student.cgpa,
+                                 Job.eligible_branches.contains(student.branch)).all()
+                db.session.remove()
+                reads[slot] += 1
+
+    def writer(stop, reads) -> None:
+        # Each (student, job) pair at most once per pass; between passes the
+        # table is emptied so the unique constraint never stops the writer.
+        fresh_connections()
+        pairs = [(student_id, int(job_id)) for job_id in backend.job_ids
+                 for student_id in backend.student_ids]
+        with app.app_context():
+            while True:
+                for student_id, job_id in pairs:
+                    if stop.is_set():
+                        return
+                    db.session.add(JobApplication(student_id=student_id, job_id=job_id))
+                    db.session.commit()
+                db.session.query(JobApplication).delete()
+                db.session.commit()
+
+    def run(use_replicas: bool) -> float:
+        # Separate processes, as in a multi-worker deployment; threads would
+        # mostly measure the GIL.
+        app.extensions["db_replicas"] = routing if use_replicas else None
+        with app.app_context():
+            db.session.query(JobApplication).delete()
+            db.session.commit()
+            db.session.remove()
+        context = multiprocessing.get_context("fork")
+        stop = context.Event()
+        reads = context.Array("l", readers)
+        processes = [context.Process(target=reader, args=(i, stop, reads)) for i in range(readers)]
+        processes.append(context.Process(target=writer, args=(stop, reads)))
+        for process in processes:
+            process.start()
+        time.sleep(seconds)
+        stop.set()
+        for process in processes:
+            process.join()
+        if any(process.exitcode for process in processes):
+            # A dead writer would leave the readers uncontended.
+            raise RuntimeError("a reader or the writer process failed; see its traceback above")
+        return sum(reads) / seconds
+
+    baseline = run(False)
+    routed = run(True)
+    shutil.rmtree(directory, ignore_errors=True)
+    return "\n".join([
+        f"read throughput with {readers} readers and 1 writer over {seconds:.0f}s",
+        f"  primary only:         {baseline:8.1f} reads/s",
+        f"  {replicas} replica(s):          {routed:8.1f} reads/s  ({routed / baseline:.2f}x)",
+    ])
+
+
+def coalesce_test(students: int, jobs: int, threads: int, applications: int,
+                  database_url: str, rng: random.Random, reset: bool = False) -> str:
+    # Apply throughput on SQLite with `threads` concurrent request threads,
+    # first one commit per application (the default apply_job path), then
+    # through the write batcher's group commits. About one in ten
+    # applications repeats an earlier one and must come back as a duplicate.
+    import threading
+    from sqlalchemy.exc import IntegrityError, OperationalError
+
+    backend = ModelBackend(students, jobs, database_url, rng, reset)
+    backend.db.session.remove()
+    app, db = backend.app, backend.db
+    from app.models import BackgroundJob, JobApplication
+    from app.utils.jobs import enqueue
+    from app.utils.write_batcher import CREATED, get_batcher
+
+    pairs = [(rng.choice(backend.student_ids), int(rng.choice(backend.job_ids)))
+             for _ in range(applications)]
+    pairs += rng.sample(pairs, applications // 10)
+    rng.shuffle(pairs)
+
+    def one_commit(student_id: int, job_id: int, stats: Dict[str, int]) -> str:
+        while True:
+            try:
+                if JobApplication.query.filter_by(student_id=student_id, job_id=job_id).first():
+                    return "duplicate"
+                application = JobApplication(student_id=student_id, job_id=job_id)
+                db.session.add(application)
+                db.session.flush()
+                enqueue("email.application_notification",
+                        {"student_id": student_id, "job_id": job_id}, priority=10,
+                        idempotency_key=f"application-notification:{application.id}")
+                db.session.commit()
+                return "created"
+            except IntegrityError:
+                db.session.rollback()
+                return "duplicate"
+            except OperationalError as exc:
+                db.session.rollback()
+                if "locked" not in str(exc):
+                    raise
+                stats["locked"] += 1
+
+    def batched(student_id: int, job_id: int, stats: Dict[str, int]) -> str:
+        outcome, _ = get_batcher().submit(student_id, job_id, app.config["TENANT"]).result()
+        return "created" if outcome == CREATED else "duplicate"
+
+    def run(apply: Callable[[int, int, Dict[str, int]], str]) -> str:
+        with app.app_context():
+            db.session.query(BackgroundJob).delete()
+            db.session.query(JobApplication).delete()
+            db.session.commit()
+            db.session.remove()
+        work = iter(pairs)
+        lock = threading.Lock()
+        latencies: List[float] = []
+        stats = {"created": 0, "duplicate": 0, "locked": 0}
+
+        def worker() -> None:
+            with app.app_context():
+                while True:
+                    with lock:
+                        pair = next(work, None)
+                    if pair is None:
+                        db.session.remove()
+                        return
+                    started = time.perf_counter()
+                    outcome = apply(*pair, stats)
+                    db.session.remove()
+                    with lock:
+                        latencies.append(time.perf_counter() - started)
+                        stats[outcome] += 1
+
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        started = time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        return (f"{len(pairs) / elapsed:8.1f} applies/s  "
+                f"p50 {Report.percentile(latencies, 50) * 1000:6.1f}ms  "
+                f"p99 {Report.percentile(latencies, 99) * 1000:6.1f}ms  "
+                f"created {stats['created']}  duplicate {stats['duplicate']}  "
+                f"locked retries {stats['locked']}")
+
+    baseline = run(one_commit)
+    coalesced = run(batched)
+    return "\n".join([
+        f"{len(pairs)} applications from {threads} threads on {database_url}",
+        f"  one commit per apply: {baseline}",
+        f"  group commits:        {coalesced}",
+    ])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Placement drive capacity simulator")
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--jobs", type=int, default=5)
+    parser.add_argument("--duration", type=float, default=60.0,
+                        help="seconds over which students arrive")
+    parser.add_argument("--arrival", choices=sorted(ARRIVALS), default="burst")
+    parser.add_argument("--backend", choices=["portal", "models"], default="portal")
+    parser.add_argument("--database-url", default="sqlite:///simulation.db")
+    parser.add_argument("--reset", action="store_true",
+                        help="let the models backend drop and reseed a database that has tables")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--commit-cost", type=float, default=0.004,
+                        help="seconds per commit charged by the portal backend")
+    parser.add_argument("--email-senders", type=int, default=2)
+    parser.add_argument("--email-time", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fanout", action="store_true",
+                        help="load test event fan-out instead of a placement drive")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--consumers", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=100)
+    parser.add_argument("--replicas", type=int, default=0,
+                        help="compare read throughput on the primary against N replicas")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--coalesce", type=int, default=0, metavar="APPLICATIONS",
+                        help="compare per-request commits against the write batcher")
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    if args.fanout:
+        print(fanout_test(args.students, args.events, args.consumers, args.queue_size,
+                          args.duration / args.events, rng))
+        return
+    if args.replicas:
+        print(replica_test(args.students, args.jobs, args.replicas, args.readers,
+                           args.duration, rng))
+        return
+    if args.coalesce:
+        print(coalesce_test(args.students, args.jobs, args.threads, args.coalesce,
+                            args.database_url, rng, args.reset))
+        return
+    if args.backend == "portal":
+        backend = PortalBackend(args.students, args.jobs, args.commit_cost, rng)
+    else:
+        backend = ModelBackend(args.students, args.jobs, args.database_url, rng, args.reset)
+
+    requests = build_sessions(ARRIVALS[args.arrival](args, rng), args.students,
+                              backend.job_ids, rng)
+    served = [backend.serve(request) for request in requests]
+    report = simulate(served, args.workers, args.email_senders, args.email_time)
+    print(f"{args.arrival} arrivals of {args.students} students over {args.duration:.0f}s "
+          f"on {args.workers} workers ({args.backend} backend)")
+    print(report.render())
+
+
+if __name__ == "__main__":
+    main()
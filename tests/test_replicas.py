@@ -0,0 +1,119 @@
+# tests/test_replicas.py
+# Read routing with SQLite files standing in for the primary and a replica.
+# Each statement is attributed to the database file that ran it.
+import shutil
+import time
+from datetime import datetime
+
+import pytest
+from flask import g
+from sqlalchemy import event
+
+from app import create_app, db, login_manager
+from app.models import Company, Job, Student, User
+from config import Config
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    def make(replicas=1):
+        primary = tmp_path / 'primary.db'
+        monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{primary}')
+        monkeypatch.setattr(Config, 'DATABASE_REPLICA_URLS',
+                            [f'sqlite:///{tmp_path}/replica{i}.db' for i in range(replicas)])
+        monkeypatch.setattr(Config, 'RATELIMIT_ENABLED', False)
+        app = create_app()
+        app.config['TESTING'] = True
+        if login_manager._user_callback is None:
+            login_manager.user_loader(lambda user_id: db.session.get(User, int(user_id)))
+
+        with app.app_context():
+            db.create_all(bind=None)
+            company = Company(email='hr@acme.test', company_name='Acme')
+            student = Student(email='s@institute.edu', name='S', roll_number='1',
+                              branch='CS', cgpa=8.0)
+            db.session.add_all([company, student])
+            db.session.flush()
+            job = Job(company_id=company.id, title='Engineer', description='d', compensation=1,
+                      min_cgpa=6, eligible_branches='CS', interview_process='x',
+                      interview_date=datetime(2025, 1, 1))
+            db.session.add(job)
+            db.session.commit()
+            app.student_id, app.job_id = student.id, job.id
+            # Replicas start as exact copies of the primary.
+            for i in range(replicas):
+                shutil.copy(primary, tmp_path / f'replica{i}.db')
+
+            app.statements = []
+            for bind in [None] + [f'replica{i}' for i in range(replicas)]:
+                engine = db.get_engine(app, bind=bind)
+                event.listen(engine, 'before_cursor_execute',
+                             lambda *args, bind=bind: app.statements.append(bind or 'primary'))
+        return app
+    return make
+
+
+def login(app):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(app.student_id)
+        session['_fresh'] = True
+    return client
+
+
+def test_read_only_view_reads_from_replica(make_app):
+    app = make_app()
+    client = login(app)
+    app.statements.clear()
+
+    assert client.get('/student/dashboard').status_code == 200
+    # The user is loaded before @read_only takes effect; the view's own
+    # queries go to the replica.
+    assert app.statements[0] == 'primary'
+    assert 'replica0' in app.statements
+
+
+def test_read_after_flush_goes_to_primary(make_app):
+    app = make_app()
+    with app.test_request_context():
+        g.db_use_replica = True
+        assert Job.query.count() == 1
+        assert app.statements == ['replica0']
+
+        db.session.add(Company(email='new@acme.test', company_name='New'))
+        db.session.flush()
+        app.statements.clear()
+        assert Company.query.count() == 2
+        assert app.statements == ['primary']
+        db.session.rollback()
+
+
+def test_primary_sticks_after_apply(make_app, monkeypatch):
+    app = make_app()
+    client = login(app)
+    response = client.post(f'/student/apply/{app.job_id}')
+    assert response.status_code == 302
+    with client.session_transaction() as session:
+        assert session['db_primary_until'] > time.time()
+
+    app.statements.clear()
+    client.get('/student/dashboard')
+    assert set(app.statements) == {'primary'}
+
+    later = time.time() + app.config['READ_YOUR_WRITES_SECONDS'] + 1
+    monkeypatch.setattr(time, 'time', lambda: later)
+    app.statements.clear()
+    client.get('/student/dashboard')
+    assert 'replica0' in app.statements
+
+
+def test_without_replicas_everything_uses_primary(make_app):
+    app = make_app(replicas=0)
+    assert app.extensions['db_replicas'] is None
+    client = login(app)
+    app.statements.clear()
+
+    assert client.get('/student/dashboard').status_code == 200
+    assert client.post(f'/student/apply/{app.job_id}').status_code == 302
+    assert client.get('/student/dashboard').status_code == 200
+    assert set(app.statements) == {'primary'}